@@ -0,0 +1,179 @@
+"""
+Pathfinding benchmark: original list-copying searches vs ghosts/search.py.
+
+Runs the same random (start, goal) pairs of walkable tiles on each board
+with both implementations and reports searches/sec and expanded nodes/sec,
+then the junction-graph A* (ghosts/junctions.py) against the new bfs.
+
+Run from the repository root:
+    python -m benchmarks.pathfinding [--pairs 300] [--repeat 3]
+"""
+import argparse
+import heapq
+import random
+import time
+from collections import deque
+
+from game.board import boards
+from ghosts import search
+from ghosts.astar import astar
+from ghosts.bfs import bfs
+from ghosts.dfs import dfs
+from ghosts.junctions import get_junction_graph, junction
+
+
+# -------------------------------------
+# Original implementations (before the shared engine), kept verbatim for comparison
+# -------------------------------------
+def legacy_bfs(start, goal, maze):
+    rows, cols = len(maze), len(maze[0])
+    queue = deque([(start, [start])])
+    visited = {start}
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+    while queue:
+        current, path = queue.popleft()
+        if current == goal:
+            return path
+
+        cx, cy = current
+        for dx, dy in directions:
+            neighbor = (cx + dx, cy + dy)
+            nx, ny = neighbor
+            if (0 <= nx < cols and 0 <= ny < rows and
+                maze[ny][nx] not in (3, 4, 5, 6, 7, 8, 9) and
+                neighbor not in visited):
+                visited.add(neighbor)
+                queue.append((neighbor, path + [neighbor]))
+    return None
+
+
+def legacy_dfs(start, goal, maze):
+    rows, cols = len(maze), len(maze[0])
+    stack = [(start, [start])]
+    visited = {start}
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+    while stack:
+        current, path = stack.pop()
+        if current == goal:
+            return path
+
+        cx, cy = current
+        for dx, dy in directions:
+            neighbor = (cx + dx, cy + dy)
+            nx, ny = neighbor
+            if (0 <= nx < cols and 0 <= ny < rows and
+                maze[ny][nx] not in (3, 4, 5, 6, 7, 8, 9) and
+                neighbor not in visited):
+                visited.add(neighbor)
+                stack.append((neighbor, path + [neighbor]))
+    return None
+
+
+def _legacy_heuristic(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def legacy_astar(start, goal, maze):
+    rows, cols = len(maze), len(maze[0])
+    open_set = []
+    heapq.heappush(open_set, (0, start, [start]))
+    g_score = {start: 0}
+    f_score = {start: _legacy_heuristic(start, goal)}
+    visited = set()
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+    while open_set:
+        current_f, current, path = heapq.heappop(open_set)
+        if current == goal:
+            return path
+        if current in visited:
+            continue
+        visited.add(current)
+
+        cx, cy = current
+        for dx, dy in directions:
+            neighbor = (cx + dx, cy + dy)
+            nx, ny = neighbor
+            if (0 <= nx < cols and 0 <= ny < rows and
+                maze[ny][nx] not in (3, 4, 5, 6, 7, 8, 9)):
+
+                tentative_g = g_score[current] + 1
+                if neighbor in visited and tentative_g >= g_score.get(neighbor, float('inf')):
+                    continue
+
+                if tentative_g < g_score.get(neighbor, float('inf')) or neighbor not in [i[1] for i in open_set]:
+                    g_score[neighbor] = tentative_g
+                    f_score[neighbor] = tentative_g + _legacy_heuristic(neighbor, goal)
+                    heapq.heappush(open_set, (f_score[neighbor], neighbor, path + [neighbor]))
+    return None
+
+
+ALGORITHMS = [
+    ("bfs", legacy_bfs, bfs, search.bfs_search),
+    ("dfs", legacy_dfs, dfs, search.dfs_search),
+    ("astar", legacy_astar, astar, search.astar_search),
+]
+
+
+def sample_pairs(maze, count, seed):
+    rng = random.Random(seed)
+    cells = [(x, y) for y, row in enumerate(maze) for x, t in enumerate(row) if t not in search.BLOCKED]
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+
+def time_searches(fn, pairs, maze, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for s, g in pairs:
+            fn(s, g, maze)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def expanded_nodes(core, pairs, maze):
+    graph = search.get_graph(maze)
+    return sum(core(graph, graph.index(s), graph.index(g))[1] for s, g in pairs)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--pairs", type=int, default=300)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    print(f"{'board':<8}{'algo':<7}{'nodes':>9}{'old nodes/s':>14}{'new nodes/s':>14}{'speedup':>9}")
+    for name, maze in boards.items():
+        pairs = sample_pairs(maze, args.pairs, args.seed)
+        for algo, old_fn, new_fn, core in ALGORITHMS:
+            # same paths (BFS/DFS) or same lengths (A*) as before
+            for s, g in pairs[:50]:
+                old_path, new_path = old_fn(s, g, maze), new_fn(s, g, maze)
+                assert (old_path is None) == (new_path is None), (algo, s, g)
+                if old_path is not None:
+                    assert len(old_path) == len(new_path) if algo == "astar" else old_path == new_path, (algo, s, g)
+
+            # expanded-node counts are the same for both (identical order for bfs/dfs)
+            nodes = expanded_nodes(core, pairs, maze)
+            t_old = time_searches(old_fn, pairs, maze, args.repeat)
+            t_new = time_searches(new_fn, pairs, maze, args.repeat)
+            print(f"{name:<8}{algo:<7}{nodes:>9}{nodes / t_old:>14,.0f}{nodes / t_new:>14,.0f}{t_old / t_new:>8.1f}x")
+
+        # junction graph: first step only, on a path as short as the bfs one
+        for s, g in pairs[:50]:
+            path, step = bfs(s, g, maze), junction(s, g, maze)
+            assert (path is None) == (step is None), ("junction", s, g)
+            if path is not None and len(path) > 1:
+                assert len(bfs(step[1], g, maze)) == len(path) - 1, ("junction", s, g)
+        graph = get_junction_graph(maze)
+        t_bfs = time_searches(bfs, pairs, maze, args.repeat)
+        t_junction = time_searches(junction, pairs, maze, args.repeat)
+        print(f"{name:<8}junction graph: {len(graph.junctions)} junctions, {len(graph.corridors)} corridors, "
+              f"{len(pairs) / t_junction:,.0f} vs bfs {len(pairs) / t_bfs:,.0f} searches/s")
+
+
+if __name__ == "__main__":
+    main()
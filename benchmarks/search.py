@@ -0,0 +1,71 @@
+"""
+Adversarial search benchmark: alpha-beta nodes with and without move ordering.
+
+Plays a headless game on each board and searches every 5th position to
+fixed depths 1..N with move ordering on and off (fresh transposition
+table per search) and reports total nodes, time and the
+effective branching factor nodes(d) / nodes(d - 1).
+
+Run from the repository root:
+    python -m benchmarks.search [--positions 20] [--max-depth 3]
+"""
+import argparse
+import random
+import time
+
+from game.engine import Simulation
+from game.map_loader import MapLoader
+from pacman_logic.alphabeta import AlphaBetaAgent
+from pacman_logic.reflex import ReflexAgent
+
+BOARDS = ["EASY", "MEDIUM", "HARD"]
+
+
+def play_and_search(board, positions, max_depth, seed):
+    """
+    Play one game with the reflex agent (plus a few random moves) and search
+    every 5th position right away, since observations share the live grid.
+    Returns {(depth, ordering): [nodes, seconds]} and the number of positions.
+    """
+    rng = random.Random(seed)
+    sim = Simulation.from_loader(MapLoader(board), seed=seed, max_ticks=positions * 5)
+    reflex = ReflexAgent()
+    totals = {(d, o): [0, 0.0] for d in range(1, max_depth + 1) for o in (False, True)}
+    searched = 0
+    state = sim.observe()
+    while not state["done"] and searched < positions:
+        if state["tick"] % 5 == 0:
+            searched += 1
+            for (depth, ordering), total in totals.items():
+                agent = AlphaBetaAgent(depth=depth, move_ordering=ordering)
+                t0 = time.perf_counter()
+                agent.get_action(state)
+                total[1] += time.perf_counter() - t0
+                total[0] += agent.nodes
+        action = rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]) if rng.random() < 0.2 else reflex.get_action(state)
+        state = sim.step(action)
+    return totals, searched
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--positions", type=int, default=20)
+    p.add_argument("--max-depth", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    print(f"{'board':<8}{'depth':>6}{'ordering':>10}{'nodes':>12}{'ms/pos':>9}{'EBF':>7}")
+    for board in BOARDS:
+        totals, searched = play_and_search(board, args.positions, args.max_depth, args.seed)
+        for ordering in (False, True):
+            prev = None
+            for depth in range(1, args.max_depth + 1):
+                nodes, elapsed = totals[(depth, ordering)]
+                ebf = f"{nodes / prev:>7.1f}" if prev else f"{'-':>7}"
+                print(f"{board:<8}{depth:>6}{'on' if ordering else 'off':>10}{nodes:>12,}"
+                      f"{elapsed * 1000 / max(1, searched):>9.1f}{ebf}")
+                prev = nodes
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import pygame
 
-def update_ghosts(ghosts, pacman, grid, tile_size, ghost_ai, frame_counter, ghost_move_delay, power_mode):
+def update_ghosts(ghosts, pacman, grid, tile_size, ghost_ai, frame_counter, ghost_move_delay, power_mode, distances=None, maze_version=None):
     
     pac_tile = (int(pacman.x // tile_size), int(pacman.y // tile_size))
 
@@ -32,7 +32,9 @@ def update_ghosts(ghosts, pacman, grid, tile_size, ghost_ai, frame_counter, ghos
                 "color": ghost.color,
                 "ghosts": ghosts,
                 "pac_dir": (int(pacman.direction.x), int(pacman.direction.y)),
-                "power_mode": power_mode
+                "power_mode": power_mode,
+                "distances": distances,
+                "maze_version": maze_version
             }
             next_tile = ghost_ai.get_next_move(game_state)
             if next_tile and next_tile != start:
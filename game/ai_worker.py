@@ -0,0 +1,234 @@
+"""
+Background planner for the Pac-Man AI, so a slow search never stalls the
+game loop.
+
+Every frame the loop hands `AIWorker.submit()` a compact snapshot (wall
+and pellet bytes plus positions and scores; see `make_snapshot`) and
+reads back whatever decision is newest with `poll()`, without waiting.
+The worker only plans for the newest snapshot and silently skips any it
+fell behind on. Each decision carries its snapshot's frame number and
+time, so the HUD can show how stale it is.
+
+The worker is a thread by default. With `use_process=True` it's a
+separate process, which keeps the search off the interpreter lock the
+render loop needs. Either way a Planner rebuilds its own board, distance
+table and pellet field from the snapshots, so nothing it mutates while
+searching is shared with the game.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+
+from game.distance_table import DistanceTable, GHOST_BLOCKED, PACMAN_BLOCKED
+from game.grid import Grid
+from game.pellet_field import PelletField
+from pacman_logic.pacman_agent import AgentSession
+
+
+def make_snapshot(frame, grid, pacman_pos, ghosts, score=0, lives=3, power_mode=False, scared_timer=0,
+                  ghost_mode="bfs", agent_type="reflex", depth=2, time_budget_ms=None):
+    """
+    Picklable planning request for one frame.
+
+    frame  : caller's frame/tick counter, echoed back with the decision
+    grid   : the game Grid (its wall layer, wall version and pellet layer are copied)
+    ghosts : ghost tiles [(x, y), ...]
+    """
+    return {
+        "frame": frame,
+        "time": time.time(),
+        "version": grid.version,
+        "width": grid.width,
+        "walls": grid.walls,
+        "pellets": bytes(grid.pellets),
+        "pacman_pos": tuple(pacman_pos),
+        "ghosts": [tuple(g) for g in ghosts],
+        "score": score,
+        "lives": lives,
+        "power_mode": power_mode,
+        "scared_timer": scared_timer,
+        "ghost_mode": ghost_mode,
+        "agent_type": agent_type,
+        "depth": depth,
+        "time_budget_ms": time_budget_ms,
+    }
+
+
+class Planner:
+    """Turns snapshots into actions with an AgentSession on a private copy of the board."""
+
+    def __init__(self):
+        self.session = AgentSession()
+        self.version = None
+        self.grid = None
+        self.table = None
+        self.ghost_table = None
+        self.field = None
+
+    def _new_grid(self, snap):
+        w = snap["width"]
+        tiles = bytes(wall + pellet for wall, pellet in zip(snap["walls"], snap["pellets"]))
+        self.grid = Grid([list(tiles[i:i + w]) for i in range(0, len(tiles), w)])
+
+    def _sync_board(self, snap):
+        if snap["version"] != self.version:
+            # new maze: everything from scratch
+            self._new_grid(snap)
+            self.table = DistanceTable(self.grid, PACMAN_BLOCKED)
+            self.ghost_table = DistanceTable(self.grid, GHOST_BLOCKED)
+            self.field = PelletField(self.table, self.grid)
+            self.version = snap["version"]
+            return
+        mine, theirs = self.grid.pellets, snap["pellets"]
+        if mine == theirs:
+            return
+        if any(p and not m for m, p in zip(mine, theirs)):
+            # pellets came back: new round on the same maze
+            self._new_grid(snap)
+            self.field = PelletField(self.table, self.grid)
+            return
+        w = self.grid.width
+        for i, (m, p) in enumerate(zip(mine, theirs)):
+            if m and not p:
+                self.grid.eat(i % w, i // w)
+
+    def plan(self, snap):
+        self._sync_board(snap)
+        state = {
+            "grid": self.grid,
+            "pacman_pos": snap["pacman_pos"],
+            "ghosts": snap["ghosts"],
+            "score": snap["score"],
+            "lives": snap["lives"],
+            "power_mode": snap["power_mode"],
+            "scared_timer": snap["scared_timer"],
+            "ghost_mode": snap["ghost_mode"],
+            "distances": self.table,
+            "ghost_distances": self.ghost_table,
+            "pellet_field": self.field.sync(),
+        }
+        return self.session.get_action(state, snap["agent_type"], snap["depth"], snap["time_budget_ms"])
+
+    def decide(self, snap):
+        """Plan for `snap` and wrap the result as a decision dict (never raises)."""
+        t0 = time.perf_counter()
+        try:
+            action = self.plan(snap)
+        except Exception:
+            print("[PACMAN AI] background planner error:")
+            traceback.print_exc()
+            action = None
+        return {
+            "action": action,
+            "frame": snap["frame"],
+            "time": snap["time"],
+            "plan_ms": (time.perf_counter() - t0) * 1000,
+        }
+
+
+def _process_main(requests, results):
+    """Worker process loop: plan for the newest queued snapshot, post the decision."""
+    planner = Planner()
+    while True:
+        snap = requests.get()
+        try:
+            while True:
+                snap = requests.get_nowait()
+        except queue.Empty:
+            pass
+        if snap is None:
+            return
+        results.put(planner.decide(snap))
+
+
+class AIWorker:
+    """
+    submit(snapshot) : hand over the newest snapshot (never blocks)
+    poll()           : newest decision so far, or None
+    staleness(frame) : (frames, ms) between that decision's snapshot and now
+    """
+
+    def __init__(self, use_process=False):
+        self.use_process = use_process
+        self.latest = None
+        self._thread = None
+        self._process = None
+        self._pending = None
+        self._wakeup = threading.Condition()
+        self._running = False
+
+    # -----------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self.latest = None
+        if self.use_process:
+            self._requests = multiprocessing.Queue()
+            self._results = multiprocessing.Queue()
+            self._process = multiprocessing.Process(
+                target=_process_main, args=(self._requests, self._results), daemon=True
+            )
+            self._process.start()
+        else:
+            self._planner = Planner()
+            self._thread = threading.Thread(target=self._thread_main, name="pacman-ai", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        if self.use_process:
+            self._requests.put(None)
+            self._process.join(timeout=1.0)
+            self._process = None
+        else:
+            with self._wakeup:
+                self._wakeup.notify()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _thread_main(self):
+        while True:
+            with self._wakeup:
+                while self._running and self._pending is None:
+                    self._wakeup.wait()
+                if not self._running:
+                    return
+                snap, self._pending = self._pending, None
+            self.latest = self._planner.decide(snap)
+
+    # -----------------------------------------------------------------
+    # Game loop side
+    # -----------------------------------------------------------------
+    def submit(self, snapshot):
+        if not self._running:
+            return
+        if self.use_process:
+            self._requests.put(snapshot)
+        else:
+            with self._wakeup:
+                self._pending = snapshot  # replaces one the worker hasn't started on
+                self._wakeup.notify()
+
+    def poll(self):
+        if self.use_process and self._running:
+            try:
+                while True:
+                    self.latest = self._results.get_nowait()
+            except queue.Empty:
+                pass
+        return self.latest
+
+    def staleness(self, frame):
+        """(frames, milliseconds) since the snapshot behind the newest decision, or None."""
+        decision = self.latest
+        if decision is None:
+            return None
+        return frame - decision["frame"], (time.time() - decision["time"]) * 1000
@@ -1,6 +1,69 @@
+"""
+Image assets, decoded once per session.
+
+Every PNG is loaded (and convert_alpha'd) the first time it is asked for,
+and each scaled variant is cached per size, so entities created for a new
+life or switching ghost state share the same surfaces instead of reading
+the file again. Shared surfaces must not be drawn onto.
+"""
+import os
+
 import pygame
 
+PLAYER_DIR = os.path.join("assets", "player_img")
+GHOST_DIR = os.path.join("assets", "ghost_img")
+PACMAN_FRAMES = 4
+SPRITE_SCALE = 0.9      # entity sprites, fraction of a tile
+FRUIT_SCALE = 0.8
+
+_images = {}    # path -> decoded surface
+_scaled = {}    # (source surface, (w, h)) -> scaled surface
+_sources = {}   # scaled surface -> source surface
+
+
+def load_image(path):
+    """Decoded image at `path` (loaded on first use)."""
+    image = _images.get(path)
+    if image is None:
+        image = _images[path] = pygame.image.load(path).convert_alpha()
+    return image
+
+
+def scaled(image, size):
+    """`image` scaled to `size` (w, h), made once per size."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    if image.get_size() == size:
+        return image
+    key = (image, size)
+    surf = _scaled.get(key)
+    if surf is None:
+        surf = _scaled[key] = pygame.transform.scale(image, size)
+        _sources[surf] = image
+    return surf
+
+
+def source(image):
+    """Full-resolution image a cached variant was scaled from (`image` itself otherwise)."""
+    return _sources.get(image, image)
+
+
+def sprite(path, tile_size, scale=SPRITE_SCALE):
+    """Square sprite for one tile: the image at `path` scaled to `scale` of `tile_size`."""
+    side = int(tile_size * scale)
+    return scaled(load_image(path), (side, side))
+
+
+def pacman_frames(tile_size):
+    """Pac-Man animation frames for `tile_size`."""
+    return [sprite(os.path.join(PLAYER_DIR, f"{i}.png"), tile_size) for i in range(1, PACMAN_FRAMES + 1)]
+
+
+def ghost_sprite(name, tile_size):
+    """Ghost sprite by name: a color, "powerup" (frightened) or "dead"."""
+    return sprite(os.path.join(GHOST_DIR, f"{name}.png"), tile_size)
+
+
 def load_and_scale_fruit(path, tile_size):
-    raw = pygame.image.load(path).convert_alpha()
-    img = pygame.transform.scale(raw, (int(tile_size * 0.8), int(tile_size * 0.8)))
-    return raw, img
\ No newline at end of file
+    raw = load_image(path)
+    img = sprite(path, tile_size, FRUIT_SCALE)
+    return raw, img
@@ -0,0 +1,79 @@
+"""
+NumPy view of a Grid for vectorized whole-board queries.
+
+The arrays are zero-copy views over the Grid's layers: the wall layer
+(static) and the pellet bytearray (live, so eaten pellets show up without
+any bookkeeping). Static masks are computed once per wall version.
+
+NumPy is optional; `board_arrays()` returns None when it isn't installed
+(or for plain list boards) and callers fall back to the list scans.
+"""
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from game.grid import Grid
+
+WALL_TILES = (3, 4, 5, 6, 7, 8)
+GATE_TILE = 9
+
+# wall version -> (walls view, wall mask); a handful of mazes at most
+_static_cache = {}
+_STATIC_CACHE_SIZE = 16
+
+
+class BoardArrays:
+    """
+    walls          : (h, w) uint8, static tile codes (pellets stripped)
+    pellets        : (h, w) uint8, live view of the pellet layer (0/1/2)
+    wall_mask      : (h, w) bool, True on walls (3-8)
+    walkable_mask  : (h, w) bool, Pac-Man walkable (not a wall; includes the gate)
+    """
+
+    def __init__(self, grid, walls, wall_mask):
+        self.walls = walls
+        self.wall_mask = wall_mask
+        self.walkable_mask = ~wall_mask
+        self.pellets = np.frombuffer(grid.pellets, dtype=np.uint8).reshape(grid.height, grid.width)
+
+    @property
+    def pellet_mask(self):
+        return self.pellets == 1
+
+    @property
+    def energizer_mask(self):
+        return self.pellets == 2
+
+    def pellets_remaining(self):
+        return int(np.count_nonzero(self.pellets))
+
+    def pellet_positions(self):
+        """(x, y) of every remaining pellet and energizer, row-major like the list scan."""
+        ys, xs = np.nonzero(self.pellets)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def empty_positions(self):
+        """(x, y) of every empty floor tile (tile 0: no wall, gate or pellet)."""
+        ys, xs = np.nonzero((self.walls == 0) & (self.pellets == 0))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def tile_counts(self, max_tile=9):
+        """Counts of each tile code 0..max_tile on the merged board."""
+        merged = self.walls + self.pellets  # pellet cells have wall code 0
+        counts = np.bincount(merged.ravel(), minlength=max_tile + 1)
+        return {k: int(counts[k]) for k in range(max_tile + 1)}
+
+
+def board_arrays(grid):
+    """Return BoardArrays for a Grid, or None without NumPy / for plain lists."""
+    if np is None or not isinstance(grid, Grid) or not grid.height:
+        return None
+    static = _static_cache.get(grid.version)
+    if static is None:
+        walls = np.frombuffer(grid.walls, dtype=np.uint8).reshape(grid.height, grid.width)
+        static = (walls, np.isin(walls, WALL_TILES))
+        if len(_static_cache) >= _STATIC_CACHE_SIZE:
+            _static_cache.pop(next(iter(_static_cache)))
+        _static_cache[grid.version] = static
+    return BoardArrays(grid, *static)
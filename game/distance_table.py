@@ -0,0 +1,140 @@
+"""
+All-pairs shortest-path distances and next hops over a maze's walkable cells.
+
+Walls never change during a round, so one table per maze turns "how far is
+A from B through the corridors" and "which tile does a ghost step to next"
+into O(1) array lookups. Storage is flat `array` buffers indexed by compact
+node ids (walkable cells only), not dicts of tuples.
+"""
+from array import array
+from collections import deque
+
+GHOST_BLOCKED = (3, 4, 5, 6, 7, 8, 9)   # ghosts can't cross the gate
+PACMAN_BLOCKED = (3, 4, 5, 6, 7, 8)     # Pac-Man can
+UNREACHABLE = 0xFFFF
+
+
+class DistanceTable:
+    """
+    dist[t * n + s]     : shortest distance between nodes s and t
+    next_hop[t * n + s] : node after s on a shortest path from s to t
+
+    Node ids are assigned in row-major order over cells whose tile is not
+    in `blocked`; `node_of[y * width + x]` maps a cell to its id (-1 = wall).
+    """
+
+    def __init__(self, grid, blocked=GHOST_BLOCKED):
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height else 0
+        self.blocked = tuple(blocked)
+        w, h = self.width, self.height
+
+        self.node_of = array("i", [-1]) * (w * h)
+        self.cells = array("i")
+        for y, row in enumerate(grid):
+            for x, t in enumerate(row):
+                if t not in self.blocked:
+                    self.node_of[y * w + x] = len(self.cells)
+                    self.cells.append(y * w + x)
+        n = self.n = len(self.cells)
+        self._link_neighbors()
+
+        self.dist = array("H", [UNREACHABLE]) * (n * n)
+        self.next_hop = array("H", [UNREACHABLE]) * (n * n)
+        for t in range(n):
+            self._bfs_from(t)
+
+    @classmethod
+    def from_buffers(cls, width, height, blocked, node_of, cells, dist, next_hop):
+        """
+        Table over already computed buffers (e.g. memoryviews of a compiled
+        map file): anything indexable like the arrays above works.
+        """
+        table = cls.__new__(cls)
+        table.width, table.height = width, height
+        table.blocked = tuple(blocked)
+        table.node_of, table.cells = node_of, cells
+        table.n = len(cells)
+        table.dist, table.next_hop = dist, next_hop
+        table._link_neighbors()
+        return table
+
+    def _link_neighbors(self):
+        """Adjacency per node (right, down, left, up — same order as the ghost searches)."""
+        w, h = self.width, self.height
+        self.neighbors = []
+        for c in self.cells:
+            x, y = c % w, c // w
+            nbrs = []
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h:
+                    j = self.node_of[ny * w + nx]
+                    if j >= 0:
+                        nbrs.append(j)
+            self.neighbors.append(tuple(nbrs))
+
+    def _bfs_from(self, t):
+        """Fill row `t`: distances to t and each node's parent towards t."""
+        n = self.n
+        dist = [UNREACHABLE] * n
+        parent = [UNREACHABLE] * n
+        dist[t] = 0
+        parent[t] = t
+        queue = deque([t])
+        neighbors = self.neighbors
+        while queue:
+            u = queue.popleft()
+            du = dist[u] + 1
+            for v in neighbors[u]:
+                if dist[v] == UNREACHABLE:
+                    dist[v] = du
+                    parent[v] = u
+                    queue.append(v)
+        base = t * n
+        self.dist[base:base + n] = array("H", dist)
+        self.next_hop[base:base + n] = array("H", parent)
+
+    # -----------------------------------------------------------------
+    # Lookups (positions are (x, y) tiles)
+    # -----------------------------------------------------------------
+    def node(self, pos):
+        """Return the node id of tile `pos`, or -1 if it is a wall / off the map."""
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.node_of[y * self.width + x]
+        return -1
+
+    def position(self, node):
+        c = self.cells[node]
+        return (c % self.width, c // self.width)
+
+    def distance(self, a, b):
+        """Maze distance between two tiles, or None if either is blocked or unreachable."""
+        s, t = self.node(a), self.node(b)
+        if s < 0 or t < 0:
+            return None
+        d = self.dist[t * self.n + s]
+        return None if d == UNREACHABLE else d
+
+    def next_step(self, a, b):
+        """First tile after `a` on a shortest path to `b` (`a` itself if a == b), or None."""
+        s, t = self.node(a), self.node(b)
+        if s < 0 or t < 0:
+            return None
+        nxt = self.next_hop[t * self.n + s]
+        if nxt == UNREACHABLE:
+            return None
+        return self.position(nxt)
+
+    def path(self, a, b):
+        """Full shortest path [a, ..., b] as (x, y) tiles, or None."""
+        s, t = self.node(a), self.node(b)
+        if s < 0 or t < 0 or self.next_hop[t * self.n + s] == UNREACHABLE:
+            return None
+        base = t * self.n
+        path = [self.position(s)]
+        while s != t:
+            s = self.next_hop[base + s]
+            path.append(self.position(s))
+        return path
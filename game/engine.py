@@ -0,0 +1,414 @@
+"""
+Headless Pac-Man simulation core.
+
+All game rules (pellets, energizers, power mode, fruit, ghosts, collisions,
+lives) live here on the tile grid, with no pygame import, so AI-vs-AI games
+can run without a display. One call to ``Simulation.step(action)`` advances
+the game by one tick (one Pac-Man tile move) and returns the new state in the
+same dict format the Pac-Man agents consume.
+
+The pygame front-end (main.py) does not run on this class yet. It still
+moves sprites in pixels per frame with its own helpers (game.state,
+game.update, game.ai_controller) and shares only the rule constants below
+and ghost_spawn_tiles. Driving it from ``step`` needs a tick clock that is
+independent of the frame rate and sub-tile interpolation in the view;
+until then, keep rule changes in both places in step.
+"""
+import random
+from ghosts.ghost_ai import GhostAI
+from pacman_logic.util import DIRECTIONS
+from game.distance_table import GHOST_BLOCKED, PACMAN_BLOCKED
+from game.grid import Grid
+from game.board_arrays import board_arrays
+from game.pellet_field import PelletField
+
+# -------------------------------------
+# Rules (shared with the pygame front-end)
+# -------------------------------------
+PELLET_SCORE = 10
+ENERGIZER_SCORE = 50
+GHOST_SCORE = 200
+FRUIT_SCORE = 100
+DEATH_PENALTY = 500
+FRUIT_TRIGGER_COUNTS = {30, 70, 120}  # spawn fruit after these many pellets
+START_LIVES = 3
+
+GHOST_COLORS = ("red", "pink", "blue", "orange")
+
+# One tick = one Pac-Man tile move. At 60 FPS, 2.5 px/frame on ~20 px tiles
+# that is ~8 frames, i.e. 7.5 ticks per second of real game time.
+TICKS_PER_SECOND = 7.5
+POWER_TICKS = int(8 * TICKS_PER_SECOND)   # power mode lasts 8 seconds
+FRUIT_TICKS = int(8 * TICKS_PER_SECOND)   # fruit visible for 8 seconds
+
+# Tiles per tick, relative to Pac-Man's 2.5 px/frame (ghost sprites use 2 / 1.2 / 3.5)
+GHOST_SPEEDS = {"normal": 0.8, "frightened": 0.5, "dead": 1.0}
+
+
+# -------------------------------------
+# Spawn helpers
+# -------------------------------------
+def ghost_spawn_tiles(grid, pacman_pos, ghost_positions, count=len(GHOST_COLORS), rng=random, safe_distance=4):
+    """
+    Pick ghost spawn tiles at least `safe_distance` away from Pac-Man
+    and never inside a wall or on the gate.
+    """
+    h, w = len(grid), len(grid[0])
+    px, py = pacman_pos
+
+    def is_valid_tile(x, y):
+        if 0 <= y < h and 0 <= x < w:
+            return grid[y][x] not in GHOST_BLOCKED
+        return False
+
+    if isinstance(grid, Grid):
+        open_cells = grid.open_cells
+    else:
+        open_cells = [(x, y) for y, row in enumerate(grid) for x, t in enumerate(row) if t not in GHOST_BLOCKED]
+
+    tiles = []
+    for _ in range(count):
+        gx, gy = ghost_positions[0] if ghost_positions else (px, py)
+        # offset ghosts by safe distance from Pac-Man
+        while abs(gx - px) < safe_distance and abs(gy - py) < safe_distance:
+            gx += rng.choice([-1, 1])
+            gy += rng.choice([-1, 1])
+            gx = max(1, min(w - 2, gx))
+            gy = max(1, min(h - 2, gy))
+
+        # ensure valid path
+        if not is_valid_tile(gx, gy) and open_cells:
+            gx, gy = rng.choice(open_cells)
+
+        tiles.append((gx, gy))
+    return tiles
+
+
+def empty_tiles(grid):
+    """
+    (x, y) of every empty floor tile (0): the Grid's live index when
+    available (don't modify it), else a NumPy or list scan.
+    """
+    if isinstance(grid, Grid):
+        return grid.empty_cells
+    arrays = board_arrays(grid)
+    if arrays is not None:
+        return arrays.empty_positions()
+    return [
+        (x, y)
+        for y, row in enumerate(grid)
+        for x, t in enumerate(row)
+        if t == 0
+    ]
+
+
+def house_position(map_loader):
+    """Return the ghost house tile (left gate tile) or the map center."""
+    gate = map_loader.find_gate_center()
+    if gate and len(gate) >= 3:
+        return gate[0], gate[2]
+    w, h = map_loader.size()
+    return w // 2, h // 2
+
+
+# -------------------------------------
+# Simulated ghost
+# -------------------------------------
+class SimGhost:
+    """
+    Tile-space ghost.
+
+    ``x``/``y`` are tile coordinates and ``tile_size`` is 1, so GhostAI can
+    read ``g.x // g.tile_size`` exactly as it does for pygame sprites.
+    """
+
+    def __init__(self, x, y, color, house_pos=None):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.tile_size = 1
+        self.state = "normal"
+        self.house_pos = house_pos
+        self.progress = 0.0  # fractional tiles accumulated towards the next move
+
+    @property
+    def pos(self):
+        return (self.x, self.y)
+
+    def set_state(self, state):
+        if self.state == "dead" and state == "frightened":
+            return  # dead ghosts can't turn blue
+        self.state = state
+
+
+# -------------------------------------
+# Simulation
+# -------------------------------------
+class Simulation:
+    """
+    Discrete, display-free Pac-Man game.
+
+    Parameters
+    ----------
+    grid : Grid or list[list[int]]
+        Board in ``grid[y][x]`` form; copied, never modified.
+    pacman_start : (int, int)
+        Pac-Man spawn tile.
+    ghost_starts : list[(int, int)]
+        Spawn tile for each ghost (one per color in GHOST_COLORS).
+    house_pos : (int, int) or None
+        Where dead ghosts return to.
+    ghost_mode : str
+        GhostAI algorithm ("bfs", "dfs", "astar", "random", "flow", "junction").
+    seed : int or None
+        Seeds fruit placement and frightened wandering.
+    max_ticks : int or None
+        Ends the game (as a loss) after this many ticks.
+    distances, pacman_distances : DistanceTable or None
+        Precomputed ghost / Pac-Man distance tables for this maze
+        (see MapLoader.distance_table); passed on to the AIs.
+    """
+
+    def __init__(self, grid, pacman_start, ghost_starts, house_pos=None, ghost_mode="bfs",
+                 lives=START_LIVES, seed=None, max_ticks=None, distances=None, pacman_distances=None):
+        # copy once; every new game then just resets the pellet layer
+        self.grid = Grid(grid)
+        self.pellet_field = PelletField(pacman_distances, self.grid) if pacman_distances else None
+        self.distances = distances
+        self.pacman_distances = pacman_distances
+        self.pacman_start = tuple(pacman_start)
+        self.ghost_starts = [tuple(p) for p in ghost_starts]
+        self.house_pos = house_pos
+        self.start_lives = lives
+        self.max_ticks = max_ticks
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.ghost_ai = GhostAI(ghost_mode, clock=self.elapsed_seconds, rng=self.rng)
+        self.reset()
+
+    @classmethod
+    def from_loader(cls, map_loader, ghost_mode="bfs", seed=None, **kwargs):
+        """Build a simulation from a MapLoader (same spawns as the pygame game)."""
+        rng = random.Random(seed)
+        grid = map_loader.get_grid()
+        pacman_pos, ghost_positions = map_loader.spawn_positions()
+        ghost_starts = ghost_spawn_tiles(grid, pacman_pos, ghost_positions, rng=rng)
+        return cls(grid, pacman_start=pacman_pos, ghost_starts=ghost_starts,
+                   house_pos=house_position(map_loader), ghost_mode=ghost_mode,
+                   seed=rng.getrandbits(32),
+                   distances=map_loader.distance_table(GHOST_BLOCKED),
+                   pacman_distances=map_loader.distance_table(PACMAN_BLOCKED), **kwargs)
+
+    # -----------------------------------------------------------------
+    # Round control
+    # -----------------------------------------------------------------
+    def reset(self):
+        """Start a new game on a fresh copy of the board."""
+        self.grid.reset()
+        self.tick = 0
+        self.score = 0
+        self.lives = self.start_lives
+        self.pellets_eaten = 0
+        self.triggered_fruits = set()
+        self.done = False
+        self.won = False
+        self.ghost_ai.state = "chase"
+        self.ghost_ai.last_switch = 0.0
+        self.reset_positions()
+        return self.observe()
+
+    def reset_positions(self):
+        """Put Pac-Man and the ghosts back on their spawns (after a death)."""
+        self.pacman_pos = self.pacman_start
+        self.pacman_prev = self.pacman_start
+        self.pacman_dir = (0, 0)
+        self.ghosts = [
+            SimGhost(x, y, color, self.house_pos)
+            for (x, y), color in zip(self.ghost_starts, GHOST_COLORS)
+        ]
+        self.power_mode = False
+        self.power_timer = 0
+        self.fruit_pos = None
+        self.fruit_timer = 0
+
+    def elapsed_seconds(self):
+        """Game time in seconds (drives GhostAI chase/scatter switching)."""
+        return self.tick / TICKS_PER_SECOND
+
+    # -----------------------------------------------------------------
+    # Stepping
+    # -----------------------------------------------------------------
+    def step(self, action):
+        """
+        Advance one tick with Pac-Man taking `action`
+        ('UP', 'DOWN', 'LEFT', 'RIGHT', 'STOP' or a (dx, dy) tuple).
+        Returns the new state (see `observe`).
+        """
+        if self.done:
+            return self.observe()
+        self.tick += 1
+
+        self._move_pacman(action)
+        self._eat_tile()
+        if not self._resolve_collisions({}):
+            previous = {id(g): g.pos for g in self.ghosts}
+            self._move_ghosts()
+            self._resolve_collisions(previous)
+
+        self._update_power()
+        self._update_fruit()
+
+        if self.grid.pellets_left == 0:
+            self.done, self.won = True, True
+        elif self.max_ticks is not None and self.tick >= self.max_ticks:
+            self.done = True
+        return self.observe()
+
+    def observe(self):
+        """Return the state dict used by pacman_logic agents, plus game flags."""
+        return {
+            "grid": self.grid,
+            "pacman_pos": self.pacman_pos,
+            "ghosts": [g.pos for g in self.ghosts],
+            "ghost_states": [g.state for g in self.ghosts],
+            "scared_timer": int(self.power_timer / TICKS_PER_SECOND),
+            "score": self.score,
+            "lives": self.lives,
+            "tick": self.tick,
+            "power_mode": self.power_mode,
+            "fruit_pos": self.fruit_pos,
+            "ghost_mode": self.ghost_ai.algorithm_name,
+            "distances": self.pacman_distances,
+            "ghost_distances": self.distances,
+            "pellet_field": self.pellet_field.sync() if self.pellet_field else None,
+            "done": self.done,
+            "won": self.won,
+        }
+
+    # -----------------------------------------------------------------
+    # Rules
+    # -----------------------------------------------------------------
+    def _move_pacman(self, action):
+        if isinstance(action, str):
+            dx, dy = DIRECTIONS.get(action, (0, 0))
+        elif action:
+            dx, dy = action
+        else:
+            dx, dy = 0, 0
+        x, y = self.pacman_pos
+        nx, ny = x + dx, y + dy
+        self.pacman_prev = self.pacman_pos
+        if 0 <= ny < len(self.grid) and 0 <= nx < len(self.grid[0]) and self.grid[ny][nx] not in PACMAN_BLOCKED:
+            self.pacman_pos = (nx, ny)
+            self.pacman_dir = (dx, dy)
+
+    def _eat_tile(self):
+        x, y = self.pacman_pos
+        tile = self.grid.eat(x, y)
+        if tile == 1:
+            self.score += PELLET_SCORE
+        elif tile == 2:
+            self.score += ENERGIZER_SCORE
+            self.power_mode, self.power_timer = True, POWER_TICKS
+            for g in self.ghosts:
+                g.set_state("frightened")
+        else:
+            return
+        self.pellets_eaten += 1
+
+    def _move_ghosts(self):
+        for g in self.ghosts:
+            g.progress += GHOST_SPEEDS.get(g.state, 1.0)
+            while g.progress >= 1.0:
+                g.progress -= 1.0
+                if g.state == "dead":
+                    self._step_dead_ghost(g)
+                else:
+                    self._step_ghost(g)
+
+    def _step_ghost(self, ghost):
+        game_state = {
+            "ghost_pos": ghost.pos,
+            "player_pos": self.pacman_pos,
+            "map": self.grid,
+            "color": ghost.color,
+            "ghosts": self.ghosts,
+            "pac_dir": self.pacman_dir,
+            "power_mode": self.power_mode,
+            "distances": self.distances,
+            "maze_version": self.grid.version,
+        }
+        next_tile = self.ghost_ai.get_next_move(game_state)
+        if next_tile:
+            ghost.x, ghost.y = next_tile
+
+    def _step_dead_ghost(self, ghost):
+        # eyes fly straight back to the house, ignoring walls
+        if not ghost.house_pos:
+            ghost.set_state("normal")
+            return
+        hx, hy = ghost.house_pos
+        if ghost.x != hx:
+            ghost.x += 1 if hx > ghost.x else -1
+        elif ghost.y != hy:
+            ghost.y += 1 if hy > ghost.y else -1
+        if ghost.pos == (hx, hy):
+            ghost.set_state("normal")
+
+    def _resolve_collisions(self, previous):
+        """
+        Handle Pac-Man touching a ghost (same tile, or swapping tiles
+        with one this tick). Returns True if Pac-Man died.
+        """
+        for g in self.ghosts:
+            touched = g.pos == self.pacman_pos or (
+                previous.get(id(g)) == self.pacman_pos and g.pos == self.pacman_prev
+            )
+            if not touched:
+                continue
+            if self.power_mode and g.state == "frightened":
+                g.set_state("dead")
+                self.score += GHOST_SCORE
+            elif g.state != "dead":
+                self._lose_life()
+                return True
+        return False
+
+    def _lose_life(self):
+        self.score -= DEATH_PENALTY
+        self.lives -= 1
+        if self.lives <= 0:
+            self.done = True
+        else:
+            self.reset_positions()
+
+    def _update_power(self):
+        if not self.power_mode:
+            return
+        self.power_timer -= 1
+        if self.power_timer <= 0:
+            self.power_mode = False
+            for g in self.ghosts:
+                if g.state != "dead":
+                    g.set_state("normal")
+
+    def _update_fruit(self):
+        if self.fruit_pos is None:
+            for trigger in FRUIT_TRIGGER_COUNTS:
+                if self.pellets_eaten >= trigger and trigger not in self.triggered_fruits:
+                    # spawn only on walkable path
+                    valid_positions = empty_tiles(self.grid)
+                    if valid_positions:
+                        self.fruit_pos = self.rng.choice(valid_positions)
+                        self.fruit_timer = FRUIT_TICKS
+                        self.triggered_fruits.add(trigger)
+                    break
+
+        if self.fruit_pos is not None:
+            if self.fruit_pos == self.pacman_pos:
+                self.fruit_pos = None
+                self.score += FRUIT_SCORE
+                return
+            self.fruit_timer -= 1
+            if self.fruit_timer <= 0:
+                self.fruit_pos = None
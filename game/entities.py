@@ -3,6 +3,8 @@ import os
 import importlib
 import random
 from game.map_loader import MapLoader
+from game.engine import ghost_spawn_tiles, GHOST_COLORS
+from game import assets
 
 
 # -------------------------------------------------
@@ -16,10 +18,7 @@ class Entity:
         self.y = y
         self.speed = speed
         self.tile_size = tile_size
-        self.sprite = pygame.image.load(sprite_path).convert_alpha()
-        self.sprite = pygame.transform.scale(
-            self.sprite, (int(tile_size * 0.9), int(tile_size * 0.9))
-        )
+        self.sprite = assets.sprite(sprite_path, tile_size)   # shared, never drawn onto
         self.rect = self.sprite.get_rect(center=(x, y))
         self.direction = pygame.Vector2(0, 0)
 
@@ -37,20 +36,14 @@ class Pacman(Entity):
     """Pac-Man controlled by player, can switch to AI."""
 
     def __init__(self, x, y, tile_size):
-        base_path = os.path.join("assets", "player_img")
-        raw_images = [
-            pygame.image.load(os.path.join(base_path, f"{i}.png")).convert_alpha()
-            for i in range(1, 5)
-        ]
-        scaled_size = (int(tile_size * 0.9), int(tile_size * 0.9))
-        self.images = [pygame.transform.scale(img, scaled_size) for img in raw_images]
+        self.images = assets.pacman_frames(tile_size)
         self.image_index = 0
         self.animation_timer = 0
         self.animation_speed = 0.15
 
         px = x * tile_size + tile_size // 2
         py = y * tile_size + tile_size // 2
-        super().__init__(px, py, os.path.join(base_path, "1.png"), tile_size, speed=2.5)
+        super().__init__(px, py, os.path.join(assets.PLAYER_DIR, "1.png"), tile_size, speed=2.5)
         self.tile_size = tile_size
 
         if self.images:
@@ -121,11 +114,7 @@ class Pacman(Entity):
             self.x = new_x
             self.y = new_y
             self.update_rect()
-            tile = grid[grid_y][grid_x]
-            if tile == 1:
-                grid[grid_y][grid_x] = 0
-            elif tile == 2:
-                grid[grid_y][grid_x] = 0
+            grid.eat(grid_x, grid_y)
         else:
             self.direction = pygame.Vector2(0, 0)
 
@@ -146,8 +135,7 @@ class Ghost(Entity):
     """Ghost with normal, frightened, and dead states."""
 
     def __init__(self, x, y, color, tile_size):
-        base_path = os.path.join("assets", "ghost_img")
-        sprite_path = os.path.join(base_path, f"{color}.png")
+        sprite_path = os.path.join(assets.GHOST_DIR, f"{color}.png")
         px = x * tile_size + tile_size // 2
         py = y * tile_size + tile_size // 2
         super().__init__(px, py, sprite_path, tile_size, speed=2)
@@ -162,23 +150,20 @@ class Ghost(Entity):
 
     def set_state(self, state):
         """Change ghost appearance and adjust speed."""
-        base_path = os.path.join("assets", "ghost_img")
         if self.state == "dead" and state == "frightened":
             return  # dead ghosts can't turn blue
 
         if state == "frightened":
-            path = os.path.join(base_path, "powerup.png")
+            name = "powerup"
             self.speed = self.speed_frightened
         elif state == "dead":
-            path = os.path.join(base_path, "dead.png")
+            name = "dead"
             self.speed = self.speed_dead
         else:
-            path = os.path.join(base_path, f"{self.color}.png")
+            name = self.color
             self.speed = self.speed_normal
 
-        sprite = pygame.image.load(path).convert_alpha()
-        sprite = pygame.transform.scale(sprite, (int(self.tile_size * 0.9), int(self.tile_size * 0.9)))
-        self.sprite = sprite
+        self.sprite = assets.ghost_sprite(name, self.tile_size)
         self.rect = self.sprite.get_rect(center=(self.x, self.y))
         self.state = state
 
@@ -230,33 +215,11 @@ def create_entities(map_loader, tile_size):
     px, py = pacman_pos
     pacman = Pacman(px, py, tile_size)
 
-    # --- safe ghost spawn (at least 4 tiles away) ---
-    def is_valid_tile(x, y):
-        if 0 <= y < len(grid) and 0 <= x < len(grid[0]):
-            return grid[y][x] not in (3, 4, 5, 6, 7, 8, 9)
-        return False
-
-    ghost_colors = ["red", "pink", "blue", "orange"]
-    ghosts = []
-    used_positions = set()
-    safe_distance = 4
-
-    for i, color in enumerate(ghost_colors):
-        gx, gy = ghost_positions[0] if ghost_positions else (px, py)
-        # offset ghosts by safe distance from Pac-Man
-        while abs(gx - px) < safe_distance and abs(gy - py) < safe_distance:
-            gx += random.choice([-1, 1])
-            gy += random.choice([-1, 1])
-            gx = max(1, min(len(grid[0]) - 2, gx))
-            gy = max(1, min(len(grid) - 2, gy))
-
-        # ensure valid path
-        while not is_valid_tile(gx, gy):
-            gx = random.randint(1, len(grid[0]) - 2)
-            gy = random.randint(1, len(grid) - 2)
-
-        ghosts.append(Ghost(gx, gy, color, tile_size))
-        used_positions.add((gx, gy))
+    # --- safe ghost spawn (at least 4 tiles away, shared with the headless engine) ---
+    ghosts = [
+        Ghost(gx, gy, color, tile_size)
+        for (gx, gy), color in zip(ghost_spawn_tiles(grid, pacman_pos, ghost_positions), GHOST_COLORS)
+    ]
 
     # assign ghost house
     try:
@@ -0,0 +1,166 @@
+"""
+Layered game board.
+
+A Grid keeps the static wall/topology layer apart from the mutable pellet
+layer:
+
+  walls    : bytes, one tile code per cell with pellets stripped (never edited
+             by gameplay)
+  pellets  : bytearray, 1 = small dot, 2 = energizer, 0 = none
+  version  : changes only when the walls change, so path/distance caches can
+             key on it while pellets get eaten
+
+For compatibility the Grid *is* also the familiar list of rows
+(``grid[y][x]``, ``len(grid)``, iteration), holding walls + pellets merged.
+Gameplay must eat pellets through `eat()` so both views stay in sync.
+
+Per-type indexes (`pellet_cells`, `empty_cells`, `open_cells`) are built on
+first use and then kept up to date by `eat()`, so win checks, fruit spawns
+and spawn selection never rescan the board. Copies made for search don't
+carry them and only pay for them if they ask.
+"""
+import itertools
+
+PELLET_TILES = (1, 2)
+
+# Global so two different wall layouts never share a version number.
+_wall_versions = itertools.count(1)
+
+# bytes.translate tables: strip pellets from the wall layer / keep only pellets
+_STRIP_PELLETS = bytes(0 if t in PELLET_TILES else t for t in range(256))
+_ONLY_PELLETS = bytes(t if t in PELLET_TILES else 0 for t in range(256))
+
+
+class Grid(list):
+    """Board as rows of tile codes, backed by separate wall and pellet layers."""
+
+    def __init__(self, tiles=()):
+        super().__init__([list(row) for row in tiles])
+        self.height = len(self)
+        self.width = len(self[0]) if self.height else 0
+
+        flat = bytes(t for row in self for t in row)
+        self.walls = flat.translate(_STRIP_PELLETS)
+        self._initial_pellets = flat.translate(_ONLY_PELLETS)
+        self._initial_rows = [tuple(row) for row in self]
+        self._initial_count = self.width * self.height - self._initial_pellets.count(0)
+
+        self.pellets = bytearray(self._initial_pellets)
+        self.pellets_left = self._initial_count
+        self.version = next(_wall_versions)
+        self._drop_indexes(walls_changed=True)
+
+    # -----------------------------------------------------------------
+    # Pellet layer
+    # -----------------------------------------------------------------
+    def eat(self, x, y):
+        """Remove the pellet at (x, y). Returns the tile eaten (1 or 2) or 0 if there was none."""
+        i = y * self.width + x
+        tile = self.pellets[i]
+        if tile:
+            self.pellets[i] = 0
+            self[y][x] = 0
+            self.pellets_left -= 1
+            if self._pellet_cells is not None:
+                self._pellet_cells.discard((x, y))
+                self._empty_cells.append((x, y))
+        return tile
+
+    def reset(self):
+        """Restore every pellet for a new round (memcpy of the pellet layer, walls untouched)."""
+        self.pellets[:] = self._initial_pellets
+        for row, initial in zip(self, self._initial_rows):
+            row[:] = initial
+        self.pellets_left = self._initial_count
+        self._drop_indexes()
+
+    # -----------------------------------------------------------------
+    # Wall layer
+    # -----------------------------------------------------------------
+    def set_wall(self, x, y, tile):
+        """
+        Change the static tile at (x, y) (wall, gate or empty floor).
+        Removes any pellet there and bumps `version`.
+        """
+        i = y * self.width + x
+        walls = bytearray(self.walls)
+        walls[i] = tile
+        self.walls = bytes(walls)
+
+        initial = bytearray(self._initial_pellets)
+        if initial[i]:
+            initial[i] = 0
+            self._initial_count -= 1
+        self._initial_pellets = bytes(initial)
+        if self.pellets[i]:
+            self.pellets[i] = 0
+            self.pellets_left -= 1
+
+        self._initial_rows = list(self._initial_rows)
+        row = list(self._initial_rows[y])
+        row[x] = tile
+        self._initial_rows[y] = tuple(row)
+        self[y][x] = tile
+        self.version = next(_wall_versions)
+        self._drop_indexes(walls_changed=True)
+
+    def tile(self, x, y):
+        return self[y][x]
+
+    @property
+    def initial_pellets(self):
+        """Pellet layer as it was at the start of the round (bytes, 0/1/2 per cell)."""
+        return self._initial_pellets
+
+    # -----------------------------------------------------------------
+    # Tile-type indexes
+    # -----------------------------------------------------------------
+    @property
+    def pellet_cells(self):
+        """Set of (x, y) holding a pellet or energizer; updated on every `eat`."""
+        if self._pellet_cells is None:
+            self._build_indexes()
+        return self._pellet_cells
+
+    @property
+    def empty_cells(self):
+        """List of (x, y) empty floor tiles (tile 0); grows on every `eat`. Don't modify."""
+        if self._empty_cells is None:
+            self._build_indexes()
+        return self._empty_cells
+
+    @property
+    def open_cells(self):
+        """Tuple of (x, y) floor tiles, with or without pellets (walls and gate excluded)."""
+        if self._open_cells is None:
+            w = self.width
+            self._open_cells = tuple((i % w, i // w) for i, t in enumerate(self.walls) if t == 0)
+        return self._open_cells
+
+    def _build_indexes(self):
+        w = self.width
+        self._pellet_cells = {(i % w, i // w) for i, p in enumerate(self.pellets) if p}
+        self._empty_cells = [
+            (i % w, i // w)
+            for i, (t, p) in enumerate(zip(self.walls, self.pellets))
+            if t == 0 and not p
+        ]
+
+    def _drop_indexes(self, walls_changed=False):
+        self._pellet_cells = None
+        self._empty_cells = None
+        if walls_changed:
+            self._open_cells = None
+
+    def copy(self):
+        """Independent Grid with the same walls (and version) and current pellets."""
+        new = Grid.__new__(Grid)
+        list.__init__(new, [row[:] for row in self])
+        new.__dict__.update(self.__dict__)
+        new.pellets = bytearray(self.pellets)
+        new._drop_indexes()
+        return new
+
+    def to_lists(self):
+        """Plain list-of-lists snapshot of the merged board."""
+        return [row[:] for row in self]
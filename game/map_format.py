@@ -0,0 +1,260 @@
+"""
+Compiled binary map format (.pacmap) and map packs.
+
+A compiled map holds everything MapLoader would otherwise derive on every
+load: the tile layer, Pac-Man / ghost walkability masks, the gate and the
+spawn tiles, and optionally the all-pairs DistanceTables for both
+walkabilities. Files are opened with mmap and only the header is parsed
+up front; the tile layer and tables are read (as zero-copy memoryviews)
+when first asked for.
+
+Layout (little-endian), every section 8-byte aligned:
+
+    header   MAGIC, width, height, section count, gate (x_left, x_right, y),
+             Pac-Man spawn (x, y), ghost spawn (x, y), name (32 bytes)
+    table    per section: name (8 bytes), offset, length
+    sections tiles, pac_walk, gh_walk (uint8 per cell) and, with distances,
+             pac./gh. + node (int32 per cell), cell (int32 per node),
+             dist / next (uint16 per node pair)
+
+A map pack is a directory of .pacmap files plus index.json ({name: entry});
+opening a pack reads only the index.
+
+Compile the predefined boards (and optionally a maze_batch pack):
+    python -m game.map_format --out maps [--distances] [--from-jsonl hard_mazes.jsonl]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from game.board import boards
+from game.distance_table import DistanceTable, GHOST_BLOCKED, PACMAN_BLOCKED
+from game.grid import Grid
+from game.map_loader import MapLoader, find_gate, find_spawns
+from game.maze_batch import maze_digest
+
+MAGIC = b"PACMAP\x00\x01"
+EXTENSION = ".pacmap"
+INDEX_FILE = "index.json"
+
+_HEADER = struct.Struct("<8sHHH3h2h2h32s")
+_SECTION = struct.Struct("<8sII")
+_ALIGN = 8
+_NONE = -1
+NAME_BYTES = 32     # UTF-8 bytes of map name stored in the header
+
+# section name prefix per walkability
+_TABLE_PREFIX = {PACMAN_BLOCKED: b"pac.", GHOST_BLOCKED: b"gh."}
+
+
+# -------------------------------------
+# Compiler
+# -------------------------------------
+def compile_map(tiles, path, name, distances=False):
+    """
+    Write `tiles` (rows of tile codes) as a compiled map; returns its index entry.
+    Raises ValueError if `name` is longer than NAME_BYTES once UTF-8 encoded.
+    """
+    encoded = name.encode()
+    if len(encoded) > NAME_BYTES:
+        raise ValueError(f"map name {name!r} is {len(encoded)} bytes encoded; the limit is {NAME_BYTES}")
+    grid = Grid(tiles)
+    w, h = grid.width, grid.height
+    gate = find_gate(grid)
+    pac, ghosts = find_spawns(grid, gate)
+
+    flat = bytes(t for row in grid for t in row)
+    sections = [
+        (b"tiles", flat),
+        (b"pac_walk", bytes(t not in PACMAN_BLOCKED for t in flat)),
+        (b"gh_walk", bytes(t not in GHOST_BLOCKED for t in flat)),
+    ]
+    if distances:
+        for blocked, prefix in _TABLE_PREFIX.items():
+            table = DistanceTable(grid, blocked)
+            sections += [
+                (prefix + b"node", _little_endian(table.node_of)),
+                (prefix + b"cell", _little_endian(table.cells)),
+                (prefix + b"dist", _little_endian(table.dist)),
+                (prefix + b"next", _little_endian(table.next_hop)),
+            ]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    entries, payload = [], bytearray()
+    for key, data in sections:
+        pad = -(offset + len(payload)) % _ALIGN
+        payload += bytes(pad)
+        entries.append(_SECTION.pack(key, offset + len(payload), len(data)))
+        payload += data
+
+    gx0, gx1, gy = gate if gate else (_NONE, _NONE, _NONE)
+    header = _HEADER.pack(MAGIC, w, h, len(sections), gx0, gx1, gy, *pac, *ghosts[0], encoded)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(entries))
+        f.write(payload)
+    return {"file": os.path.basename(path), "width": w, "height": h,
+            "hash": maze_digest(grid), "distances": bool(distances)}
+
+
+def _little_endian(buf):
+    if sys.byteorder != "little":
+        buf = array(buf.typecode, buf)
+        buf.byteswap()
+    return buf.tobytes()
+
+
+# -------------------------------------
+# Reader
+# -------------------------------------
+class CompiledMap:
+    """Read-only, memory-mapped view of a .pacmap file (see the module docstring)."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.width, self.height, count, gx0, gx1, gy,
+         px, py, hx, hy, name) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a compiled map")
+        self.name = name.rstrip(b"\x00").decode()
+        self.gate = (gx0, gx1, gy) if gy != _NONE else None
+        self.pacman_spawn = (px, py)
+        self.ghost_spawns = [(hx, hy)]
+        self._sections = {}
+        for i in range(count):
+            key, offset, length = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            self._sections[key.rstrip(b"\x00")] = (offset, length)
+        self._tables = {}
+
+    def section(self, key, fmt="B"):
+        """memoryview of a section cast to struct format `fmt`, or None if absent."""
+        entry = self._sections.get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        view = memoryview(self._mm)[offset:offset + length]
+        if fmt == "B":
+            return view
+        if sys.byteorder != "little":
+            # fall back to a swapped copy on big-endian machines
+            buf = array(fmt, view.tobytes())
+            buf.byteswap()
+            return buf
+        return view.cast(fmt)
+
+    @property
+    def tiles(self):
+        """Tile layer, one byte per cell, row-major."""
+        return self.section(b"tiles")
+
+    def tile_rows(self):
+        w = self.width
+        tiles = self.tiles
+        return [list(tiles[y * w:(y + 1) * w]) for y in range(self.height)]
+
+    def walkable_mask(self, ghosts=False):
+        return self.section(b"gh_walk" if ghosts else b"pac_walk")
+
+    def has_distances(self):
+        return b"pac.dist" in self._sections
+
+    def distance_table(self, blocked=GHOST_BLOCKED):
+        """Precomputed DistanceTable for `blocked` over the mapped buffers, or None."""
+        blocked = tuple(blocked)
+        prefix = _TABLE_PREFIX.get(blocked)
+        if prefix is None or prefix + b"dist" not in self._sections:
+            return None
+        table = self._tables.get(blocked)
+        if table is None:
+            table = self._tables[blocked] = DistanceTable.from_buffers(
+                self.width, self.height, blocked,
+                self.section(prefix + b"node", "i"), self.section(prefix + b"cell", "i"),
+                self.section(prefix + b"dist", "H"), self.section(prefix + b"next", "H"),
+            )
+        return table
+
+
+# -------------------------------------
+# Map packs
+# -------------------------------------
+class MapPack:
+    """Directory of compiled maps; only index.json is read until a map is opened."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            self.index = json.load(f)["maps"]
+        self._open = {}
+
+    def names(self):
+        return list(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def open(self, name):
+        """CompiledMap for `name` (mapped on first use)."""
+        compiled = self._open.get(name)
+        if compiled is None:
+            compiled = self._open[name] = CompiledMap(os.path.join(self.directory, self.index[name]["file"]))
+        return compiled
+
+    def loader(self, name, **kwargs):
+        """MapLoader over the named map (kwargs: seed, mutate_predefined)."""
+        return MapLoader(compiled=self.open(name), **kwargs)
+
+
+def compile_pack(maps, directory, distances=False, workers=None):
+    """
+    Compile {name: tile rows} into `directory` and write its index.
+    Maps are compiled over a process pool (`workers`, default all cores;
+    1 compiles in this process): distance tables dominate the cost.
+    """
+    os.makedirs(directory, exist_ok=True)
+    names = list(maps)
+    args = ([maps[n] for n in names], [os.path.join(directory, n + EXTENSION) for n in names],
+            names, [distances] * len(names))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(names) < 2:
+        entries = list(map(compile_map, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(compile_map, *args, chunksize=16))
+    index = dict(zip(names, entries))
+    with open(os.path.join(directory, INDEX_FILE), "w") as f:
+        json.dump({"format": 1, "maps": index}, f, indent=1)
+    return index
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Compile maps into a map pack directory.")
+    p.add_argument("--out", default="maps", help="map pack directory")
+    p.add_argument("--boards", nargs="*", default=list(boards), choices=list(boards),
+                   help="predefined boards to include")
+    p.add_argument("--from-jsonl", nargs="*", default=[], help="maze packs written by game.maze_batch")
+    p.add_argument("--distances", action="store_true", help="store all-pairs distance tables too")
+    p.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    args = p.parse_args(argv)
+
+    maps = {name: boards[name] for name in args.boards}
+    for path in args.from_jsonl:
+        with open(path) as f:
+            for line in f:
+                v = json.loads(line)
+                maps[f"{v['board']}-{v['seed']}"] = v["grid"]
+    compile_pack(maps, args.out, args.distances, args.workers)
+    print(f"[MAPS] compiled {len(maps)} maps -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
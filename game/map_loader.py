@@ -1,14 +1,84 @@
 from game.board import boards
 from game.maze_generator import mutate_predefined_maze
-import random
+from game.distance_table import DistanceTable, GHOST_BLOCKED, PACMAN_BLOCKED
+from game.grid import Grid
+from game.board_arrays import board_arrays
+from game.pellet_field import PelletField
+
+# tile-cluster flips per mutated board
+MUTATION_CHANGES = 80
+
+
+# -----------------------------------------------------------------
+# Board analysis (also used by the map compiler, game/map_format.py)
+# -----------------------------------------------------------------
+def find_gate(grid):
+    """Find the ghost gate (two adjacent 9 tiles): (x_left, x_right, y) or None."""
+    for y, row in enumerate(grid):
+        for x in range(len(row) - 1):
+            if row[x] == 9 and row[x + 1] == 9:
+                return (x, x + 1, y)
+    return None
+
+
+def nearest_open(grid, pos):
+    """
+    Nearest open floor tile to `pos` (Manhattan distance, ties by row then
+    column). Walks rings of growing distance around `pos` over the wall
+    layer, so the cost is O(d^2) for a tile d steps away, not a scan of the
+    whole board.
+    """
+    if not grid.open_cells:
+        return pos
+    w, h, walls = grid.width, grid.height, grid.walls
+    px, py = pos
+    for d in range(w + h + abs(px) + abs(py)):
+        ring = []
+        for dy in range(-d, d + 1):
+            y = py + dy
+            if not 0 <= y < h:
+                continue
+            rest = d - abs(dy)
+            for x in {px - rest, px + rest}:
+                if 0 <= x < w and walls[y * w + x] == 0:
+                    ring.append((y, x))
+        if ring:
+            y, x = min(ring)
+            return (x, y)
+    return pos
+
+
+def find_spawns(grid, gate):
+    """Safe spawn tiles for Pac-Man and ghosts: (pacman_pos, [ghost_pos])."""
+    w, h = grid.width, grid.height
+    if not gate:
+        # fallback: open tile nearest the center of the map
+        center = nearest_open(grid, (w // 2, h // 2))
+        return center, [center]
+
+    xL, xR, y = gate
+    pacman_pos = ((xL + xR) // 2, min(y + 1, h - 1))
+    ghosts = [((xL + xR) // 2, max(y - 1, 0))]
+
+    # --- ensure pacman spawn is not inside a wall ---
+    def is_walkable(tile):
+        return tile in (0, 1, 2, 9)
+
+    gx, gy = pacman_pos
+    if not is_walkable(grid[gy][gx]):
+        pacman_pos = nearest_open(grid, pacman_pos)
+
+    return pacman_pos, ghosts
 
 
 class MapLoader:
-    def __init__(self, difficulty="MEDIUM", seed=None, mutate_predefined=False):
+    def __init__(self, difficulty="MEDIUM", seed=None, mutate_predefined=False, compiled=None):
         """
         MapLoader loads either:
           - Static predefined Pac-Man boards, or
-          - Mutated predefined boards (small random variations)
+          - Mutated predefined boards (small random variations), or
+          - Compiled map files (game/map_format.py), whose gate, spawns and
+            distance tables are read from the file instead of recomputed
 
         Parameters
         ----------
@@ -21,13 +91,24 @@ class MapLoader:
             - If None, mutations are different every time.
         mutate_predefined : bool
             Whether to apply slight random modifications to the base map.
+        compiled : CompiledMap, path or None
+            Load this compiled map (`difficulty` becomes its name). Its
+            precomputed data is used as long as the walls are unmutated.
         """
         self.mutate_predefined = bool(mutate_predefined)
         self.difficulty = difficulty.upper() if isinstance(difficulty, str) else "MEDIUM"
         self.seed = seed  # stores the random seed for consistent results
 
+        if compiled is not None and not hasattr(compiled, "tile_rows"):
+            from game.map_format import CompiledMap
+            compiled = CompiledMap(compiled)
+        self.compiled = compiled
+        self._compiled_version = None
+
         # Normalize difficulty name (case-insensitive)
-        if self.difficulty not in boards:
+        if compiled is not None:
+            self.difficulty = compiled.name
+        elif self.difficulty not in boards:
             for k in boards:
                 if k.upper() == self.difficulty:
                     self.difficulty = k
@@ -36,6 +117,7 @@ class MapLoader:
                 self.difficulty = "MEDIUM"  # fallback
 
         self.grid = None
+        self._distance_tables = {}
         self._load()
 
     # -----------------------------------------------------------------
@@ -43,24 +125,37 @@ class MapLoader:
     # -----------------------------------------------------------------
     def _load(self):
         """Load the map — either as-is or with small random changes."""
-        # Save RNG state and apply our own seed (so mutations are repeatable)
-        state = self._set_seed_safely()
-
-        base = boards[self.difficulty]
+        base = self.compiled.tile_rows() if self.compiled is not None else boards[self.difficulty]
         if self.mutate_predefined:
-            # Mutate base board using our (possibly seeded) random generator
-            self.grid = mutate_predefined_maze(base, changes=80, seed=self.seed)
+            # Mutate base board with its own random.Random(seed) (global RNG untouched),
+            # so mutations are repeatable and safe to generate concurrently
+            self.grid = Grid(mutate_predefined_maze(base, changes=MUTATION_CHANGES, seed=self.seed))
         else:
             # No mutation → load the original static board
-            self.grid = base
-
-        # Restore RNG to previous state so it doesn’t affect other random parts of the game
-        self._restore_seed_state(state)
+            # (Grid copies it, so eating pellets never touches boards[...])
+            self.grid = Grid(base)
+            if self.compiled is not None:
+                self._compiled_version = self.grid.version
 
         # Cache dimensions for quick access
         self._w = len(self.grid[0]) if self.grid else 0
         self._h = len(self.grid) if self.grid else 0
 
+        # Walls may have changed -> distance tables are rebuilt on next use
+        self._distance_tables = {}
+        self._pellet_field = None
+
+    def _precomputed(self):
+        """The compiled map, if the current walls are exactly its walls."""
+        if self.compiled is not None and self._compiled_version == self.grid.version:
+            return self.compiled
+        return None
+
+    @property
+    def version(self):
+        """Wall-layout version of the current grid (unchanged by eating pellets)."""
+        return self.grid.version
+
     # -----------------------------------------------------------------
     # Control methods
     # -----------------------------------------------------------------
@@ -90,7 +185,7 @@ class MapLoader:
     # Accessors and utilities
     # -----------------------------------------------------------------
     def get_grid(self):
-        """Return the current board as a 2D list."""
+        """Return the current board as a Grid (reads like a 2D list, grid[y][x])."""
         return self.grid
 
     def get_tile(self, x, y):
@@ -105,8 +200,46 @@ class MapLoader:
         """Return (width, height) of the grid."""
         return (self._w, self._h) if self.grid else (0, 0)
 
+    def distance_table(self, blocked=GHOST_BLOCKED):
+        """
+        Return the all-pairs DistanceTable for the current walls.
+
+        Built on first use and cached until the maze is reloaded
+        (`regenerate` / `set_mutation_mode`); eating pellets doesn't
+        affect it since pellet tiles stay walkable.
+        """
+        key = tuple(blocked)
+        table = self._distance_tables.get(key)
+        if table is None:
+            compiled = self._precomputed()
+            if compiled is not None:
+                table = compiled.distance_table(key)
+            if table is None:
+                table = DistanceTable(self.grid, key)
+            self._distance_tables[key] = table
+        return table
+
+    def masks(self):
+        """
+        NumPy view of the current grid (wall / pellet / energizer masks,
+        see game.board_arrays), or None if NumPy isn't installed.
+        """
+        return board_arrays(self.grid)
+
+    def pellet_field(self):
+        """
+        Nearest-pellet distance field (Pac-Man walkability) for the current
+        grid, brought up to date with any pellets eaten since the last call.
+        """
+        if self._pellet_field is None:
+            self._pellet_field = PelletField(self.distance_table(PACMAN_BLOCKED), self.grid)
+        return self._pellet_field.sync()
+
     def count_tiles(self):
         """Return a dictionary with counts of each tile type (0–9)."""
+        arrays = self.masks()
+        if arrays is not None:
+            return arrays.tile_counts()
         counts = {k: 0 for k in range(10)}
         for row in self.grid:
             for t in row:
@@ -116,76 +249,14 @@ class MapLoader:
 
     def find_gate_center(self):
         """Find the ghost gate (two adjacent 9 tiles)."""
-        for y, row in enumerate(self.grid):
-            for x in range(len(row) - 1):
-                if row[x] == 9 and row[x + 1] == 9:
-                    return (x, x + 1, y)
-        return None
+        compiled = self._precomputed()
+        if compiled is not None:
+            return compiled.gate
+        return find_gate(self.grid)
 
     def spawn_positions(self):
         """Find safe spawn tiles for Pac-Man and ghosts."""
-        gate = self.find_gate_center()
-        if not gate:
-            # fallback: center of map
-            center_x = self._w // 2
-            center_y = self._h // 2
-            return (center_x, center_y), [(center_x, center_y)]
-
-        xL, xR, y = gate
-        pacman_pos = ((xL + xR) // 2, min(y + 1, self._h - 1))
-        ghosts = [((xL + xR) // 2, max(y - 1, 0))]
-
-        # --- ensure pacman spawn is not inside a wall ---
-        def is_walkable(tile):
-            return tile in (0, 1, 2, 9)
-
-        gx, gy = pacman_pos
-        if not is_walkable(self.grid[gy][gx]):
-            # search nearby open tiles in spiral pattern
-            for radius in range(1, 6):
-                for dy in range(-radius, radius + 1):
-                    for dx in range(-radius, radius + 1):
-                        nx, ny = gx + dx, gy + dy
-                        if (
-                            0 <= nx < self._w
-                            and 0 <= ny < self._h
-                            and is_walkable(self.grid[ny][nx])
-                        ):
-                            pacman_pos = (nx, ny)
-                            return pacman_pos, ghosts
-
-        return pacman_pos, ghosts
-
-    # -----------------------------------------------------------------
-    # Random seed handling
-    # -----------------------------------------------------------------
-    def _set_seed_safely(self):
-        """
-        Temporarily apply our own random seed.
-
-        Why:
-            - We want maze mutations to be reproducible when using the same seed.
-            - We also don’t want to interfere with the global random generator
-              that other parts of the game might be using.
-
-        What it does:
-            1. Saves the current global random state.
-            2. Applies our seed (if provided).
-            3. Returns the saved state so we can restore it later.
-        """
-        if self.seed is None:
-            return None
-        state = random.getstate()   # snapshot current global RNG
-        random.seed(self.seed)      # apply deterministic seed
-        return state
-
-    def _restore_seed_state(self, state):
-        """
-        Restore the random generator to its previous global state.
-
-        Why:
-            - Ensures that other parts of the game using random (e.g. ghost AI,
-              fruit spawns, animations) are unaffected by our seeding.
-        """
-        if state is not None:
-            random.setstate(state)
+        compiled = self._precomputed()
+        if compiled is not None:
+            return compiled.pacman_spawn, list(compiled.ghost_spawns)
+        return find_spawns(self.grid, self.find_gate_center())
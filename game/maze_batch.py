@@ -0,0 +1,99 @@
+"""
+Batch generation of mutated mazes, reproducible and spread over all cores.
+
+Variant i of a batch is the board mutated with seed `base_seed + i`, on its
+own random.Random stream, so it's the same maze as
+MapLoader(difficulty, seed=base_seed + i, mutate_predefined=True) no matter
+which process made it or in what order. Variants are deduplicated by a
+hash of their tiles (the lowest seed of each distinct maze is kept).
+
+Pre-generate a pack of test mazes (JSON lines: board, seed, hash, grid):
+    python -m game.maze_batch --board HARD --count 5000 --out hard_mazes.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.board import boards
+from game.map_loader import MUTATION_CHANGES
+from game.maze_generator import mutate_predefined_maze
+
+# seeds per pool task: enough work to hide the pickling round trip
+CHUNK_SIZE = 64
+
+
+def maze_digest(grid):
+    """Content hash of a maze (dimensions + tiles), hex string."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(grid[0]) if grid else 0}x{len(grid)}:".encode())
+    for row in grid:
+        h.update(bytes(row))
+    return h.hexdigest()
+
+
+def _mutate_range(difficulty, seeds, changes):
+    """Worker: [(seed, digest, grid rows)] for each seed."""
+    base = boards[difficulty]
+    out = []
+    for seed in seeds:
+        grid = mutate_predefined_maze(base, changes=changes, rng=random.Random(seed))
+        out.append((seed, maze_digest(grid), grid))
+    return out
+
+
+def generate_variants(difficulty, count, base_seed=0, changes=MUTATION_CHANGES, workers=None):
+    """
+    Mutate `difficulty`'s board with seeds base_seed .. base_seed + count - 1
+    and return the distinct results in seed order, as dicts
+    {"board", "seed", "hash", "grid"} (grid: list of rows).
+
+    workers : process count (default: all cores); 1 generates in this process.
+    """
+    if difficulty not in boards:
+        raise ValueError(f"Unknown board: {difficulty}")
+    seeds = range(base_seed, base_seed + count)
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, count, CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(chunks) == 1:
+        results = [_mutate_range(difficulty, chunk, changes) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map keeps chunk order, so the kept seed per maze never depends on timing
+            results = list(pool.map(_mutate_range, [difficulty] * len(chunks), chunks, [changes] * len(chunks)))
+
+    variants, seen = [], set()
+    for chunk in results:
+        for seed, digest, grid in chunk:
+            if digest in seen:
+                continue
+            seen.add(digest)
+            variants.append({"board": difficulty, "seed": seed, "hash": digest, "grid": grid})
+    return variants
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Pre-generate distinct mutated mazes.")
+    p.add_argument("--board", default="MEDIUM", choices=list(boards))
+    p.add_argument("--count", type=int, default=1000, help="seeds to try (duplicates are dropped)")
+    p.add_argument("--seed", type=int, default=0, help="first seed")
+    p.add_argument("--changes", type=int, default=MUTATION_CHANGES)
+    p.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    p.add_argument("--out", default="mazes.jsonl")
+    args = p.parse_args(argv)
+
+    start = time.perf_counter()
+    variants = generate_variants(args.board, args.count, args.seed, args.changes, args.workers)
+    with open(args.out, "w") as f:
+        for v in variants:
+            f.write(json.dumps(v) + "\n")
+    print(f"[MAZES] {len(variants)} distinct of {args.count} {args.board} variants -> {args.out} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
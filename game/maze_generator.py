@@ -17,96 +17,99 @@ def is_walkable(tile: int) -> bool:
     return tile in WALKABLE_TILES
 
 
-def find_connected_components(grid):
-    """Return a list of connected walkable areas (each is a list of (x, y) cells)."""
+def ensure_fully_connected(grid):
+    """
+    Guarantee that all walkable areas are reachable by connecting components.
+
+    Near-linear in the grid size: union-find labels the walkable components,
+    then one multi-source BFS grows all of them at once through tiles that
+    may be carved (not protected). Wherever two grown regions touch there is
+    a candidate corridor of known length. Taking candidates shortest first
+    and keeping those that still join two separate groups (Kruskal) links
+    every component with the shortest corridors, each carved once along its
+    BFS path, which never crosses protected tiles.
+    """
     height = len(grid)
     width = len(grid[0]) if height else 0
-    visited = [[False] * width for _ in range(height)]
-    components = []
-
-    for y in range(height):
-        for x in range(width):
-            if visited[y][x] or not is_walkable(grid[y][x]):
-                continue
-
-            queue = deque([(x, y)])
-            visited[y][x] = True
-            component = [(x, y)]
-
-            while queue:
-                cx, cy = queue.popleft()
-                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < width and 0 <= ny < height:
-                        if not visited[ny][nx] and is_walkable(grid[ny][nx]):
-                            visited[ny][nx] = True
-                            queue.append((nx, ny))
-                            component.append((nx, ny))
-
-            components.append(component)
-
-    return components
-
-
-def carve_corridor(grid, start, end):
-    """Open a simple straight corridor between two coordinates."""
-    x1, y1 = start
-    x2, y2 = end
-    cx, cy = x1, y1
-
-    # Step horizontally
-    step_x = 1 if x2 > cx else -1
-    while cx != x2:
-        if grid[cy][cx] not in PROTECTED_TILES:
-            grid[cy][cx] = 0
-        cx += step_x
-
-    # Step vertically
-    step_y = 1 if y2 > cy else -1
-    while cy != y2:
-        if grid[cy][cx] not in PROTECTED_TILES:
-            grid[cy][cx] = 0
-        cy += step_y
-
-    # Final cell
-    if grid[cy][cx] not in PROTECTED_TILES:
-        grid[cy][cx] = 0
-
-
-def ensure_fully_connected(grid):
-    """Guarantee that all walkable areas are reachable by connecting components."""
-    components = find_connected_components(grid)
-    if len(components) <= 1:
+    size = width * height
+    walkable = bytearray(size)
+    carvable = bytearray(size)
+    for y, row in enumerate(grid):
+        for x, tile in enumerate(row):
+            if is_walkable(tile):
+                walkable[y * width + x] = 1
+            elif tile not in PROTECTED_TILES:
+                carvable[y * width + x] = 1
+
+    parent = list(range(size))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a, b):
+        a, b = find(a), find(b)
+        if a == b:
+            return False
+        parent[b] = a
+        return True
+
+    # components: union every walkable cell with its right and lower neighbours
+    cells = [i for i in range(size) if walkable[i]]
+    for i in cells:
+        if i % width + 1 < width and walkable[i + 1]:
+            union(i, i + 1)
+        if i + width < size and walkable[i + width]:
+            union(i, i + width)
+    owner = [-1] * size
+    for i in cells:
+        owner[i] = find(i)
+    groups = len(set(owner[i] for i in cells))
+    if groups <= 1:
         return
 
-    # Merge smaller areas into the largest one
-    components.sort(key=len, reverse=True)
-    main = components[0]
-
-    for comp in components[1:]:
-        closest_pair = None
-        closest_distance = float("inf")
-
-        for (x1, y1) in main:
-            for (x2, y2) in comp:
-                d = abs(x1 - x2) + abs(y1 - y2)
-                if d < closest_distance:
-                    closest_distance = d
-                    closest_pair = ((x1, y1), (x2, y2))
-
-        if closest_pair:
-            carve_corridor(grid, *closest_pair)
-
-        # Recompute main component
-        components = find_connected_components(grid)
-        components.sort(key=len, reverse=True)
-        main = components[0]
+    # grow every component at once; came[] leads back to the component
+    dist = [-1] * size
+    came = [-1] * size
+    for i in cells:
+        dist[i] = 0
+    queue = deque(cells)
+    bridges = []
+    while queue:
+        u = queue.popleft()
+        x = u % width
+        for v in (u + 1 if x + 1 < width else -1, u - 1 if x > 0 else -1, u + width, u - width):
+            if not (0 <= v < size) or not (walkable[v] or carvable[v]):
+                continue
+            if dist[v] < 0:
+                dist[v] = dist[u] + 1
+                came[v] = u
+                owner[v] = owner[u]
+                queue.append(v)
+            elif owner[v] != owner[u]:
+                bridges.append((dist[u] + dist[v], u, v))
+
+    # shortest corridors first, skipping those between already joined groups
+    bridges.sort()
+    for _, u, v in bridges:
+        if not union(owner[u], owner[v]):
+            continue
+        for i in (u, v):
+            while not walkable[i]:
+                grid[i // width][i % width] = 0
+                walkable[i] = 1
+                i = came[i]
+        groups -= 1
+        if groups == 1:
+            break
 
 
 # -------------------------------------
 # Maze mutation logic
 # -------------------------------------
-def mutate_predefined_maze(board, changes=120, wall_to_path_prob=0.8, path_to_wall_prob=0.1, seed=None):
+def mutate_predefined_maze(board, changes=120, wall_to_path_prob=0.8, path_to_wall_prob=0.1, seed=None, rng=None):
     """
     Randomly modify a predefined Pac-Man maze by flipping small clusters of tiles.
 
@@ -115,9 +118,13 @@ def mutate_predefined_maze(board, changes=120, wall_to_path_prob=0.8, path_to_wa
       - Occasionally adds new walls (path → wall)
       - Keeps symmetry (left mirrored to right)
       - Ensures maze stays fully connected and playable
+
+    Randomness comes from `rng` if given, else a private random.Random(seed)
+    (same maze as seeding the global generator used to give), else the
+    global generator. The global state is never reseeded.
     """
-    if seed is not None:
-        random.seed(seed)
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
 
     grid = copy.deepcopy(board)
     height = len(grid)
@@ -136,16 +143,16 @@ def mutate_predefined_maze(board, changes=120, wall_to_path_prob=0.8, path_to_wa
                     continue
 
                 tile = grid[y][x]
-                if is_walkable(tile) and random.random() < path_to_wall_prob:
+                if is_walkable(tile) and rng.random() < path_to_wall_prob:
                     grid[y][x] = 3  # small wall
-                elif not is_walkable(tile) and random.random() < wall_to_path_prob:
+                elif not is_walkable(tile) and rng.random() < wall_to_path_prob:
                     grid[y][x] = 0  # open path
 
     # Apply random cluster mutations on the left half
     for _ in range(changes):
-        x = random.randint(2, width // 2 - 2)
-        y = random.randint(1, height - 2)
-        flip_cluster(x, y, radius=random.choice([1, 2]))
+        x = rng.randint(2, width // 2 - 2)
+        y = rng.randint(1, height - 2)
+        flip_cluster(x, y, radius=rng.choice([1, 2]))
 
     # Mirror horizontally for symmetry
     for y in range(height):
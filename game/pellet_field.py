@@ -0,0 +1,162 @@
+"""
+Distance to the nearest pellet from every walkable tile, kept up to date incrementally.
+
+A multi-source BFS from all remaining pellets over a DistanceTable's graph
+gives, for each node, the true maze distance to the closest pellet and
+which pellet that is (its "owner"). When a pellet is eaten only the region
+it owned is recomputed, seeded from that region's border; when pellets come
+back (undo, new round) they are propagated outwards from the new source.
+"Distance to nearest food" is then one array lookup.
+"""
+import heapq
+from array import array
+from collections import deque
+
+from game.distance_table import UNREACHABLE
+
+# Rebuild from scratch instead of patching when this many pellets come back at once
+_FULL_REBUILD_ADDS = 16
+
+
+class PelletField:
+    """
+    dist[node]  : maze distance to the nearest remaining pellet (UNREACHABLE if none)
+    owner[node] : node id of that pellet (-1 if none)
+
+    Invariant: every node's owner is reachable from it through nodes with
+    the same owner, so an owner's region can be found by a local BFS.
+    """
+
+    def __init__(self, table, grid):
+        self.table = table
+        self.grid = grid
+        n = table.n
+        self.dist = array("H", [UNREACHABLE]) * n
+        self.owner = array("i", [-1]) * n
+        self._known = set()
+        self.rebuild()
+
+    # -----------------------------------------------------------------
+    # Keeping in sync with the grid
+    # -----------------------------------------------------------------
+    def rebuild(self):
+        """Full multi-source BFS from the grid's current pellets."""
+        n = self.table.n
+        self.dist[:] = array("H", [UNREACHABLE]) * n
+        self.owner[:] = array("i", [-1]) * n
+        self._known = set(self.grid.pellet_cells)
+
+        queue = deque()
+        for pos in self._known:
+            s = self.table.node(pos)
+            if s >= 0:
+                self.dist[s] = 0
+                self.owner[s] = s
+                queue.append(s)
+        self._propagate(queue)
+
+    def sync(self):
+        """Apply pellets eaten (or restored) on the grid since the last sync."""
+        current = self.grid.pellet_cells
+        if len(current) == len(self._known) and current == self._known:
+            return self
+        eaten = self._known - current
+        added = current - self._known
+        if len(added) > _FULL_REBUILD_ADDS:
+            self.rebuild()
+            return self
+        for pos in eaten:
+            self.remove(pos)
+        for pos in added:
+            self.add(pos)
+        return self
+
+    # -----------------------------------------------------------------
+    # Incremental updates
+    # -----------------------------------------------------------------
+    def remove(self, pos):
+        """Pellet at `pos` was eaten: recompute only the region it was nearest to."""
+        self._known.discard(pos)
+        p = self.table.node(pos)
+        if p < 0 or self.owner[p] != p:
+            return
+        dist, owner, neighbors = self.dist, self.owner, self.table.neighbors
+
+        # collect p's region and clear it
+        region = [p]
+        owner[p] = -1
+        i = 0
+        while i < len(region):
+            u = region[i]
+            i += 1
+            for v in neighbors[u]:
+                if owner[v] == p:
+                    owner[v] = -1
+                    region.append(v)
+        for u in region:
+            dist[u] = UNREACHABLE
+
+        # seed from the border (nodes outside keep their distances), then Dijkstra inside
+        heap = []
+        for u in region:
+            best, best_owner = UNREACHABLE, -1
+            for v in neighbors[u]:
+                if owner[v] >= 0 and dist[v] + 1 < best:
+                    best, best_owner = dist[v] + 1, owner[v]
+            if best_owner >= 0:
+                dist[u], owner[u] = best, best_owner
+                heap.append((best, u))
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d != dist[u]:
+                continue
+            for v in neighbors[u]:
+                if d + 1 < dist[v]:
+                    dist[v] = d + 1
+                    owner[v] = owner[u]
+                    heapq.heappush(heap, (d + 1, v))
+
+    def add(self, pos):
+        """Pellet at `pos` came back: claim every node now at least as close to it."""
+        self._known.add(pos)
+        p = self.table.node(pos)
+        if p < 0:
+            return
+        self.dist[p] = 0
+        self.owner[p] = p
+        self._propagate(deque([p]), claim_ties=True)
+
+    def _propagate(self, queue, claim_ties=False):
+        """
+        BFS outwards from `queue`, taking over nodes that get closer. With
+        `claim_ties` (a single new source) equally close nodes are taken over
+        too, so the regions left to the other owners stay connected.
+        """
+        dist, owner, neighbors = self.dist, self.owner, self.table.neighbors
+        while queue:
+            u = queue.popleft()
+            d = dist[u] + 1
+            o = owner[u]
+            for v in neighbors[u]:
+                if d < dist[v] or (claim_ties and d == dist[v] and owner[v] != o):
+                    dist[v] = d
+                    owner[v] = o
+                    queue.append(v)
+
+    # -----------------------------------------------------------------
+    # Lookups
+    # -----------------------------------------------------------------
+    def distance(self, pos):
+        """Maze distance from `pos` to the nearest pellet, or None (off the graph / no pellets)."""
+        u = self.table.node(pos)
+        if u < 0 or self.dist[u] == UNREACHABLE:
+            return None
+        return self.dist[u]
+
+    def nearest(self, pos):
+        """(distance, pellet (x, y)) for the nearest pellet to `pos`, or None."""
+        u = self.table.node(pos)
+        if u < 0 or self.owner[u] < 0:
+            return None
+        return self.dist[u], self.table.position(self.owner[u])
@@ -1,9 +1,17 @@
+import weakref
+
 import pygame
-from game.ui import draw_hud, draw_power_bar
+from game import assets
+from game.ui import draw_hud, draw_power_bar, get_font
 
 MIN_TILE = 6
 MAX_TILE = 64
 
+WALL_COLOR = (0, 0, 255)
+GATE_COLOR = (255, 0, 0)
+PELLET_COLOR = (255, 255, 255)
+ENERGIZER_COLOR = (255, 184, 151)
+
 def compute_tile_size(screen_w, screen_h, grid_w, grid_h, margin=40):
     if grid_w == 0 or grid_h == 0:
         return 20
@@ -13,9 +21,9 @@ def compute_tile_size(screen_w, screen_h, grid_w, grid_h, margin=40):
     return max(MIN_TILE, min(MAX_TILE, ts))
 
 def draw_grid(surface, grid, tile_size):
-    wall_color = (0,0,255)
-    pellet_color = (255,255,255)
-    energizer_color = (255,184,151)
+    wall_color = WALL_COLOR
+    pellet_color = PELLET_COLOR
+    energizer_color = ENERGIZER_COLOR
     for y, row in enumerate(grid):
         for x, tile in enumerate(row):
             cx = x * tile_size + tile_size//2
@@ -30,6 +38,276 @@ def draw_grid(surface, grid, tile_size):
             elif tile == 2:
                 pygame.draw.circle(surface, energizer_color, (cx,cy), tile_size//3)
 
+class TileAtlas:
+    """
+    Everything drawn on the maze, pre-scaled once for one tile size: wall,
+    gate and pellet pieces (tile-sized, transparent) and, on demand, entity
+    sprites scaled from their full-resolution source images.
+    """
+
+    def __init__(self, tile_size):
+        ts = self.tile_size = tile_size
+        half = ts // 2
+        self.wall = pygame.Surface((ts, ts), pygame.SRCALPHA)
+        pygame.draw.rect(self.wall, WALL_COLOR, self.wall.get_rect(), 3, border_radius=4)
+        self.gate = pygame.Surface((ts, ts), pygame.SRCALPHA)
+        pygame.draw.line(self.gate, GATE_COLOR, (0, half), (ts, half), 2)
+        self.pellets = {}
+        for tile, color, radius in ((1, PELLET_COLOR, ts // 6), (2, ENERGIZER_COLOR, ts // 3)):
+            piece = pygame.Surface((ts, ts), pygame.SRCALPHA)
+            pygame.draw.circle(piece, color, (half, half), radius)
+            self.pellets[tile] = piece
+        # source sprite -> (scale, scaled copy); entries go away with their sprite
+        self._sprites = weakref.WeakKeyDictionary()
+
+    def sprite(self, image, scale):
+        """`image` scaled by `scale`, made on first use and reused afterwards."""
+        if scale == 1:
+            return image
+        cached = self._sprites.get(image)
+        if cached is None or cached[0] != scale:
+            w, h = image.get_size()
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            cached = self._sprites[image] = (scale, pygame.transform.smoothscale(assets.source(image), size))
+        return cached[1]
+
+
+# tile size -> atlas; a window only ever shows one or two sizes
+_atlases = {}
+_ATLAS_CACHE_SIZE = 4
+
+
+def tile_atlas(tile_size):
+    """Shared TileAtlas for `tile_size`."""
+    atlas = _atlases.get(tile_size)
+    if atlas is None:
+        if len(_atlases) >= _ATLAS_CACHE_SIZE:
+            _atlases.pop(next(iter(_atlases)))
+        atlas = _atlases[tile_size] = TileAtlas(tile_size)
+    return atlas
+
+
+# (wall version, tile size) -> wall/gate layer; only a couple of mazes are alive at once
+_static_layers = {}
+_STATIC_LAYER_CACHE_SIZE = 4
+
+
+def static_layer(grid, tile_size):
+    """Walls and gate of `grid` drawn once per (wall version, tile size) on black."""
+    key = (grid.version, tile_size)
+    layer = _static_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface((grid.width * tile_size, grid.height * tile_size))
+        layer.fill((0, 0, 0))
+        atlas = tile_atlas(tile_size)
+        walls = grid.walls
+        for y in range(grid.height):
+            for x in range(grid.width):
+                tile = walls[y * grid.width + x]
+                if tile in (3, 4, 5, 6, 7, 8):
+                    layer.blit(atlas.wall, (x * tile_size, y * tile_size))
+                elif tile == 9:
+                    layer.blit(atlas.gate, (x * tile_size, y * tile_size))
+        if len(_static_layers) >= _STATIC_LAYER_CACHE_SIZE:
+            _static_layers.pop(next(iter(_static_layers)))
+        _static_layers[key] = layer
+    return layer
+
+
+class MazeRenderer:
+    """
+    Dirty-rect renderer: the alternative to redrawing the whole maze and
+    flipping a full-screen smoothscale every frame.
+
+    `board` is the cached wall layer plus the pellets still on the grid;
+    eaten (or restored) pellets are patched tile by tile by diffing the
+    grid's pellet layer. Each frame only the previous and current sprite
+    rects and the changed tiles are redrawn on the render surface, and
+    only those areas (scaled to the screen) plus the overlay rects are
+    pushed to the display with pygame.display.update.
+    """
+
+    def __init__(self):
+        self.board = None
+        self._key = None
+        self._drawn = None
+        self._surface = None
+        self._screen_size = None
+        self._sprite_rects = []
+        self._overlay_rects = []
+        self._full = True
+
+    def invalidate(self):
+        """Redraw and present everything next frame (e.g. after a full-screen message)."""
+        self._full = True
+
+    def _sync_board(self, grid, tile_size):
+        """Bring `board` up to date with the grid; returns the tile rects that changed."""
+        key = (grid.version, tile_size)
+        if key != self._key:
+            self._key = key
+            self.static = static_layer(grid, tile_size)
+            self.board = self.static.copy()
+            self._drawn = bytearray(grid.width * grid.height)
+            self._full = True
+        pellets = grid.pellets
+        if self._drawn == pellets:
+            return []
+        changed = []
+        w = grid.width
+        pieces = tile_atlas(tile_size).pellets
+        for i, (old, new) in enumerate(zip(self._drawn, pellets)):
+            if old != new:
+                x, y = i % w, i // w
+                rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                self.board.blit(self.static, rect, rect)
+                if new in pieces:
+                    self.board.blit(pieces[new], rect)
+                changed.append(rect)
+        self._drawn[:] = pellets
+        return changed
+
+    def draw(self, surface, grid, tile_size, sprites, full=False):
+        """
+        Compose the frame on `surface` (render resolution). `sprites` is a
+        list of (image, rect). Returns the dirty rects, or None when the
+        whole surface was redrawn (`full`, or the first frame on a surface).
+        """
+        changed = self._sync_board(grid, tile_size)
+        if surface is not self._surface:
+            self._surface = surface
+            self._full = True
+        rects = [rect.copy() for _, rect in sprites]
+        if full or self._full:
+            surface.blit(self.board, (0, 0))
+            dirty = None
+        else:
+            dirty = self._sprite_rects + changed + rects
+            for rect in self._sprite_rects + changed:
+                surface.blit(self.board, rect, rect)
+        for image, rect in sprites:
+            surface.blit(image, rect)
+        self._sprite_rects = rects
+        return dirty
+
+    def present(self, screen, surface, dirty):
+        """
+        Copy the dirty areas of `surface` onto `screen` (scaled if sizes
+        differ) and restore the screen under last frame's overlays.
+        Returns the screen rects to pass to pygame.display.update once the
+        overlays are drawn (then report them with `overlays_drawn`).
+        """
+        size = screen.get_size()
+        if dirty is None or self._full or size != self._screen_size:
+            self._screen_size = size
+            self._full = False
+            if size == surface.get_size():
+                screen.blit(surface, (0, 0))
+            else:
+                screen.blit(pygame.transform.smoothscale(surface, size), (0, 0))
+            return [screen.get_rect()]
+
+        sx = size[0] / surface.get_width()
+        sy = size[1] / surface.get_height()
+        bounds = surface.get_rect()
+        updates = []
+        # overlay areas are restored whole, so translucent boxes don't stack up
+        back = [pygame.Rect(int(r.x / sx), int(r.y / sy), int(r.w / sx) + 2, int(r.h / sy) + 2)
+                for r in self._overlay_rects]
+        for rect in dirty + back:
+            rect = rect.clip(bounds)
+            if not rect.w or not rect.h:
+                continue
+            if sx == 1 and sy == 1:
+                updates.append(screen.blit(surface, rect, rect))
+                continue
+            # scale a slightly larger area and keep the inside, so edges blend like a full smoothscale
+            src = rect.inflate(4, 4).clip(bounds)
+            x0, y0 = int(src.x * sx), int(src.y * sy)
+            x1, y1 = int(src.right * sx + 0.999), int(src.bottom * sy + 0.999)
+            scaled = pygame.transform.smoothscale(surface.subsurface(src), (x1 - x0, y1 - y0))
+            inner = pygame.Rect(int(rect.x * sx), int(rect.y * sy),
+                                int(rect.right * sx + 0.999) - int(rect.x * sx),
+                                int(rect.bottom * sy + 0.999) - int(rect.y * sy))
+            updates.append(screen.blit(scaled, inner, inner.move(-x0, -y0)))
+        return updates
+
+    def overlays_drawn(self, rects):
+        """Screen rects covered by this frame's HUD/legend/bars (restored next frame)."""
+        rects = [r for r in rects if r]
+        previous, self._overlay_rects = self._overlay_rects, rects
+        return previous + rects
+
+
+class DisplayRenderer(MazeRenderer):
+    """
+    MazeRenderer that draws straight onto the display: the tile size is
+    fitted to the window (recomputed whenever its size changes, e.g. after
+    VIDEORESIZE or fullscreen) and the maze is centered in it. The board and
+    the sprites come from the TileAtlas for that size, so nothing is
+    rescaled per frame. Game logic keeps its own tile size; positions are
+    mapped with `scale` and `origin`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tile_size = None
+        self.scale = 1
+        self.origin = (0, 0)
+        self.atlas = None
+        self._layout = None
+        self._board_rect = None
+
+    def layout(self, screen, grid):
+        """Fit the tile size and origin to `screen`; rebuilds the atlas/board on change."""
+        size = screen.get_size()
+        key = (size, grid.width, grid.height)
+        if key != self._layout:
+            self._layout = key
+            ts = max(1, min(size[0] // max(1, grid.width), size[1] // max(1, grid.height)))
+            self.tile_size = ts
+            self.origin = ((size[0] - grid.width * ts) // 2, (size[1] - grid.height * ts) // 2)
+            self._board_rect = pygame.Rect(self.origin, (grid.width * ts, grid.height * ts))
+            self.atlas = tile_atlas(ts)
+            self._full = True
+
+    def draw(self, screen, grid, tile_size, sprites, full=False):
+        """
+        Draw the frame on `screen`. `tile_size` is the game's tile size the
+        sprite rects are in. Returns the screen rects to pass to
+        pygame.display.update once the overlays are drawn (report them with
+        `overlays_drawn`).
+        """
+        self.layout(screen, grid)
+        changed = self._sync_board(grid, self.tile_size)
+        if screen is not self._surface:
+            self._surface = screen
+            self._full = True
+        scale = self.scale = self.tile_size / tile_size
+        ox, oy = self.origin
+        placed = []
+        for image, rect in sprites:
+            image = self.atlas.sprite(image, scale)
+            center = (ox + round(rect.centerx * scale), oy + round(rect.centery * scale))
+            placed.append((image, image.get_rect(center=center)))
+
+        if full or self._full:
+            self._full = False
+            screen.fill((0, 0, 0))
+            screen.blit(self.board, self.origin)
+            updates = [screen.get_rect()]
+        else:
+            updates = self._sprite_rects + [r.move(ox, oy) for r in changed] + self._overlay_rects
+            for rect in updates:
+                if not self._board_rect.contains(rect):
+                    screen.fill((0, 0, 0), rect)
+                screen.blit(self.board, rect, rect.move(-ox, -oy))
+        for image, rect in placed:
+            updates.append(screen.blit(image, rect))
+        self._sprite_rects = [rect for _, rect in placed]
+        return updates
+
+
 def make_screen_for_grid(grid, tile_size):
     w = len(grid[0]) if grid else 0
     h = len(grid) if grid else 0
@@ -53,7 +331,7 @@ def render_frame(screen, state):
 
     scaled = pygame.transform.smoothscale(rs, screen.get_size())
     screen.blit(scaled, (0,0))
-    draw_hud(screen, pygame.font.SysFont("Arial", 20), state.difficulty, state.score, state.lives, getattr(state.pacman, "use_ai", False), state.mutate)
+    draw_hud(screen, get_font("Arial", 20), state.difficulty, state.score, state.lives, getattr(state.pacman, "use_ai", False), state.mutate)
     if state.power_mode:
         draw_power_bar(screen, state.power_timer, 8*60)
     pygame.display.flip()
\ No newline at end of file
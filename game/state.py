@@ -3,6 +3,7 @@ from game.entities import create_entities
 import pygame
 import random
 from game.renderer import build_render_surface
+from game import assets
 
 class GameState:
     def __init__(self, difficulty="MEDIUM", mutate=False, screen_size=(800,600)):
@@ -22,7 +23,7 @@ class GameState:
         self.render_surface = None
 
         # fruit / round state
-        self.fruit_raw = pygame.image.load("assets/fructul_pasiunii.png").convert_alpha()
+        self.fruit_raw = assets.load_image("assets/fructul_pasiunii.png")
         self.fruit_img = None
         self.fruit_active = False
         self.fruit_timer = 0
@@ -44,7 +45,7 @@ class GameState:
 
     def _rescale_assets(self):
         if self.fruit_raw:
-            self.fruit_img = pygame.transform.scale(self.fruit_raw, (int(self.tile_size * 0.8), int(self.tile_size * 0.8)))
+            self.fruit_img = assets.scaled(self.fruit_raw, (self.tile_size * assets.FRUIT_SCALE,) * 2)
 
     def rebuild_render_surface(self):
         w = max(1, self.grid_w * self.tile_size)
@@ -67,6 +68,7 @@ class GameState:
 
     def initialize_round(self):
         # reset round state and rescale assets
+        self.grid.reset()
         self._rescale_assets()
         self.fruit_active = False
         self.fruit_timer = 0
@@ -119,7 +121,8 @@ def initialize_round(loader, grid, tile_size, fruit_raw, gx, gy):
      pellets_eaten, triggered_fruits, score, lives,
      power_mode, power_timer, render_surface, pacman, ghosts)
     """
-    fruit_img = pygame.transform.scale(fruit_raw, (int(tile_size * 0.8), int(tile_size * 0.8)))
+    grid.reset()  # restore pellets (memcpy) instead of reloading the board
+    fruit_img = assets.scaled(fruit_raw, (tile_size * assets.FRUIT_SCALE,) * 2)
     fruit_active, fruit_timer, fruit_pos = False, 0, None
     pellets_eaten, triggered_fruits = 0, set()
     score, lives = 0, 3
@@ -1,24 +1,101 @@
 import pygame
 
-def draw_hud(screen, font, difficulty, score, lives, pacman_ai, mutate):
-    """Draw top HUD bar with info text."""
+# (name, size) -> Font; SysFont scans the installed fonts, so look each one up once per session
+_fonts = {}
+
+
+def get_font(name="Arial", size=20):
+    """Shared pygame.font.SysFont(name, size)."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+
+def hud_fields(difficulty, score, lives, pacman_ai, mutate, ai_lag=None):
+    """HUD text split into fields (joined with " | " it is the full HUD line)."""
     ai_text = "AI: ON" if pacman_ai else "AI: OFF"
+    if ai_lag is not None:
+        ai_text += f" (decision {ai_lag[0]}f / {ai_lag[1]:.0f}ms old)"
+    return [difficulty, "Mutated" if mutate else "Predefined", f"Score: {score}", f"Lives: {lives}", ai_text]
+
+
+def draw_hud(screen, font, difficulty, score, lives, pacman_ai, mutate, ai_lag=None):
+    """Draw top HUD bar with info text. `ai_lag` is (frames, ms) behind for a background AI decision."""
     ai_color = (0, 255, 0) if pacman_ai else (255, 80, 80)
-    text = f"{difficulty} | {'Mutated' if mutate else 'Predefined'} | Score: {score} | Lives: {lives} | {ai_text}"
+    text = " | ".join(hud_fields(difficulty, score, lives, pacman_ai, mutate, ai_lag))
     hud = font.render(text, True, ai_color)
-    screen.blit(hud, (10, 10))
+    return screen.blit(hud, (10, 10))
 
 # new helpers
 def draw_power_bar(screen, power_timer, power_time, color=(0, 150, 255), height=8):
-    """Draw power-up remaining bar at bottom of the screen."""
+    """Draw power-up remaining bar at bottom of the screen; returns the area drawn."""
     if power_time <= 0:
-        return
+        return None
     w = screen.get_width()
     bar_width = int((max(0, power_timer) / power_time) * w)
-    pygame.draw.rect(screen, color, (0, screen.get_height() - height - 2, bar_width, height))
+    return pygame.draw.rect(screen, color, (0, screen.get_height() - height - 2, bar_width, height))
 
 def draw_center_text(screen, font, text, color=(255, 255, 0), y_offset=0):
     """Draw a centered message on the screen (useful for READY!, GAME OVER, YOU WIN)."""
     surf = font.render(text, True, color)
     rect = surf.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 + y_offset))
     screen.blit(surf, rect)
+
+
+class OverlayCompositor:
+    """
+    HUD and legend drawn from prerendered surfaces. Fonts are looked up
+    once; each HUD field is re-rendered only when its text (or the HUD
+    color) changes, and the legend box is rendered once per set of lines.
+    """
+
+    LEGEND_PADDING = 6
+
+    def __init__(self, font=None, legend_font=None):
+        self.font = font or get_font("Arial", 20)
+        self.legend_font = legend_font or get_font("Arial", 16)
+        self._fields = []       # per HUD field: (text, color, surface)
+        self._separator = {}    # color -> rendered " | "
+        self._legend = None     # (lines, surface)
+
+    def _render_field(self, i, text, color):
+        if i < len(self._fields):
+            cached = self._fields[i]
+            if cached[0] == text and cached[1] == color:
+                return cached[2]
+        else:
+            self._fields.append(None)
+        surf = self.font.render(text, True, color)
+        self._fields[i] = (text, color, surf)
+        return surf
+
+    def draw_hud(self, screen, difficulty, score, lives, pacman_ai, mutate, ai_lag=None, pos=(10, 10)):
+        """Same HUD line as ui.draw_hud; returns the area drawn."""
+        color = (0, 255, 0) if pacman_ai else (255, 80, 80)
+        sep = self._separator.get(color)
+        if sep is None:
+            sep = self._separator[color] = self.font.render(" | ", True, color)
+        x, y = pos
+        area = pygame.Rect(pos, (0, 0))
+        for i, text in enumerate(hud_fields(difficulty, score, lives, pacman_ai, mutate, ai_lag)):
+            if i:
+                x = screen.blit(sep, (x, y)).right
+            rect = screen.blit(self._render_field(i, text, color), (x, y))
+            area.union_ip(rect)
+            x = rect.right
+        return area
+
+    def draw_legend(self, screen, lines, pos=(10, 10)):
+        """Semi-transparent box listing `lines`; returns the area drawn."""
+        lines = tuple(lines)
+        if self._legend is None or self._legend[0] != lines:
+            font, padding = self.legend_font, self.LEGEND_PADDING
+            line_h = font.get_linesize()
+            box = pygame.Surface((max(font.size(l)[0] for l in lines) + padding * 2,
+                                  line_h * len(lines) + padding * 2), pygame.SRCALPHA)
+            box.fill((0, 0, 0, 160))
+            for i, l in enumerate(lines):
+                box.blit(font.render(l, True, (230, 230, 230)), (padding, padding + i * line_h))
+            self._legend = (lines, box)
+        return screen.blit(self._legend[1], pos)
@@ -1,4 +1,5 @@
 import random
+from game.engine import PELLET_SCORE, ENERGIZER_SCORE, empty_tiles
 
 def handle_pellets(grid, pacman, tile_size, score, pellets_eaten, ghosts, power_mode, power_timer, POWER_TIME):
     
@@ -8,14 +9,12 @@ def handle_pellets(grid, pacman, tile_size, score, pellets_eaten, ghosts, power_
         for dx in (-1, 0, 1):
             tx, ty = px + dx, py + dy
             if 0 <= ty < len(grid) and 0 <= tx < len(grid[0]):
-                tile = grid[ty][tx]
+                tile = grid.eat(tx, ty)
                 if tile == 1:
-                    grid[ty][tx] = 0
-                    score += 10
+                    score += PELLET_SCORE
                     pellets_eaten += 1
                 elif tile == 2:
-                    grid[ty][tx] = 0
-                    score += 50
+                    score += ENERGIZER_SCORE
                     pellets_eaten += 1
                     power_mode, power_timer = True, POWER_TIME
                     for g in ghosts:
@@ -29,12 +28,7 @@ def handle_fruit(grid, pacman, tile_size, pellets_eaten, triggered_fruits, fruit
         for trigger in FRUIT_TRIGGER_COUNTS:
             if pellets_eaten >= trigger and trigger not in triggered_fruits:
                 # spawn only on walkable path
-                valid_positions = [
-                    (x, y)
-                    for y, row in enumerate(grid)
-                    for x, t in enumerate(row)
-                    if t == 0
-                ]
+                valid_positions = empty_tiles(grid)
                 if valid_positions:
                     spawn_x, spawn_y = random.choice(valid_positions)
                     fruit_pos = (
@@ -0,0 +1,60 @@
+"""
+Flow fields: one reverse BFS per distinct target, shared by every ghost.
+
+Chasing ghosts mostly aim at the same few tiles (Pac-Man's tile, the
+scatter corners), so instead of one search per ghost, FlowFields keeps
+each target's distance field and a ghost just steps to its neighbour
+nearest the target. The cost is O(cells) per distinct target, whatever
+the number of ghosts, and nothing is precomputed for targets nobody
+aims at (unlike the all-pairs DistanceTable).
+"""
+from collections import OrderedDict
+
+from .search import BLOCKED, distance_field, get_graph
+
+
+class FlowFields:
+    """Distance fields per target for one maze (wall version), LRU-bounded."""
+
+    def __init__(self, size=16, blocked=BLOCKED):
+        self.size = size
+        self.blocked = blocked
+        self._graph = None
+        self._fields = OrderedDict()
+        self.searches = 0
+
+    def field(self, maze, target):
+        """(graph, distance array) for `target`, computing it on first use."""
+        graph = get_graph(maze, self.blocked)
+        if graph is not self._graph:
+            # new maze (or walls changed): every field is stale
+            self._fields.clear()
+            self._graph = graph
+        t = graph.index(target)
+        if t < 0:
+            return graph, None
+        dist = self._fields.get(t)
+        if dist is None:
+            dist = self._fields[t] = distance_field(graph, t)
+            self.searches += 1
+            if len(self._fields) > self.size:
+                self._fields.popitem(last=False)
+        else:
+            self._fields.move_to_end(t)
+        return graph, dist
+
+    def next_step(self, maze, start, target):
+        """Neighbour of `start` closest to `target` (first of equals: right, down, left, up), or None."""
+        if not maze or not maze[0]:
+            return None
+        graph, dist = self.field(maze, target)
+        s = graph.index(start)
+        if dist is None or s < 0:
+            return None
+        best, best_d = -1, dist[s] if dist[s] >= 0 else 0x7FFFFFFF
+        for d in graph.offsets:
+            v = s + d
+            dv = dist[v]
+            if 0 <= dv < best_d:
+                best, best_d = v, dv
+        return graph.position(best) if best >= 0 else None
@@ -1,12 +1,15 @@
 import random
 import time
+from collections import OrderedDict
 
 class GhostAI:
-    def __init__(self, mode="bfs"):
+    def __init__(self, mode="bfs", clock=None, rng=None, cache_size=512):
         from .bfs import bfs
         from .dfs import dfs
         from .astar import astar
         from .random_ai import RandomAI
+        from .flow import FlowFields
+        from .junctions import junction
 
         self.algorithm_name = mode
         if mode == "bfs":
@@ -17,24 +20,95 @@ class GhostAI:
             self.algorithm = astar
         elif mode == "random":
             self.algorithm = RandomAI().get_next_move
+        elif mode == "junction":
+            # A* over intersections, corridors contracted into weighted edges
+            self.algorithm = junction
+        elif mode == "flow":
+            # shared per-target distance fields; bfs only for direct algorithm calls
+            self.algorithm = bfs
         else:
             raise ValueError(f"Unknown mode: {mode}")
 
+        # clock/rng are injectable so headless simulations can run on
+        # tick time and stay reproducible; defaults are wall time + global random
+        self.clock = clock or time.time
+        self.rng = rng or random
+
+        # (start, target) -> next hop, LRU-bounded; valid for one maze version
+        self.cache_size = cache_size
+        self._path_cache = OrderedDict()
+        self._cache_version = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.table_hits = 0   # answered by a precomputed DistanceTable (not counted above)
+        # "flow" mode: distance field per target, shared by all ghosts using this GhostAI
+        self.flow = FlowFields() if mode == "flow" else None
+
         # --- new state variables ---
         self.state = "chase"  # can be chase / scatter / frightened
-        self.last_switch = time.time()
+        self.last_switch = self.clock()
         self.scatter_duration = 7
         self.chase_duration = 20
 
+    def invalidate_cache(self):
+        """Forget cached routes (call when the walls change)."""
+        self._path_cache.clear()
+
+    def cache_stats(self):
+        """
+        Hits/misses of the (start, target) LRU only. bfs/astar with a
+        `distances` table (as main.py and the engine pass) never reach it;
+        their lookups are reported separately as `table_hits`.
+        """
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "table_hits": self.table_hits,
+            "misses": self.cache_misses,
+            "size": len(self._path_cache),
+            "hit_rate": self.cache_hits / total if total else 0.0,
+        }
+
+    def _cached_next_hop(self, start, target, maze, version):
+        """
+        Next tile from `start` towards `target`, or None if unreachable.
+        Cached per (start, target) while `version` (wall layout) stays the same;
+        pellets being eaten never changes the version. Only used by searched
+        routes: table-backed bfs/astar skip this cache (see cache_stats).
+        """
+        if version != self._cache_version:
+            self.invalidate_cache()
+            self._cache_version = version
+
+        key = (start, target)
+        cache = self._path_cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return cache[key]
+
+        self.cache_misses += 1
+        path = self.algorithm(start, target, maze)
+        nxt = path[1] if path and len(path) >= 2 else None
+        cache[key] = nxt
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return nxt
+
     def update_state(self, power_mode):
         """Handle switching between chase/scatter or frightened."""
-        now = time.time()
+        now = self.clock()
 
         # scared overrides other states
         if power_mode:
             self.state = "frightened"
             return
 
+        # power mode ended -> resume chasing
+        if self.state == "frightened":
+            self.state = "chase"
+            self.last_switch = now
+
         # alternate between chase <-> scatter
         if self.state == "chase" and now - self.last_switch > self.chase_duration:
             self.state = "scatter"
@@ -67,7 +141,7 @@ class GhostAI:
         # === frightened: random wandering ===
         if self.state == "frightened":
             dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-            random.shuffle(dirs)
+            self.rng.shuffle(dirs)
             for dx, dy in dirs:
                 nx, ny = gx + dx, gy + dy
                 if 0 <= ny < len(maze) and 0 <= nx < len(maze[0]) and maze[ny][nx] not in (3,4,5,6,7,8,9):
@@ -111,12 +185,30 @@ class GhostAI:
             max(0, min(len(maze) - 1, target[1])),
         )
 
-        path = self.algorithm(ghost_pos, target, maze)
+        distances = game_state.get("distances")
+        version = game_state.get("maze_version", getattr(maze, "version", None))
+        if self.flow is not None:
+            # one reverse BFS per distinct target, then a neighbour lookup per ghost
+            nxt = self.flow.next_step(maze, ghost_pos, target)
+            path = [ghost_pos, nxt] if nxt is not None else None
+        elif distances is not None and self.algorithm_name in ("bfs", "astar"):
+            # shortest-path modes: one table lookup instead of a full search
+            self.table_hits += 1
+            nxt = distances.next_step(ghost_pos, target)
+            if nxt is None or nxt == ghost_pos:
+                path = None
+            else:
+                path = [ghost_pos, nxt]
+        elif self.algorithm_name != "random" and version is not None:
+            nxt = self._cached_next_hop(ghost_pos, target, maze, version)
+            path = [ghost_pos, nxt] if nxt is not None else None
+        else:
+            path = self.algorithm(ghost_pos, target, maze)
 
         # fallback: random move
         if not path or len(path) < 2:
             dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-            random.shuffle(dirs)
+            self.rng.shuffle(dirs)
             for dx, dy in dirs:
                 nx, ny = gx + dx, gy + dy
                 if 0 <= ny < len(maze) and 0 <= nx < len(maze[0]) and maze[ny][nx] not in (3,4,5,6,7,8,9):
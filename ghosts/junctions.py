@@ -0,0 +1,212 @@
+"""
+Corridor-contracted junction graph for long-range ghost pathfinding.
+
+Most maze cells are corridor cells with exactly two open neighbours, and
+a cell-by-cell search spends most of its time walking them. Here every
+cell with any other number of open neighbours is a junction (node), and
+every corridor between two junctions is one weighted edge (its length).
+A* then runs over the few hundred junctions, and the route is only
+expanded back into cells for the first step the ghost takes.
+
+Built once per maze (wall version) on top of the padded MazeGraph from
+search.py, so indices and neighbour order are the same as bfs/astar.
+"""
+import heapq
+from array import array
+
+from .search import BLOCKED, get_graph
+
+_INF = 0x7FFFFFFF
+
+
+class JunctionGraph:
+    """
+    junctions[k]    : flat cell index of junction node k
+    edges[k]        : (length, other node, first cell of the corridor leaving k)
+    corridors[c]    : (node at one end, node at the other end, cells from the first end)
+    node_of[i]      : junction id of cell i, or -1
+    corridor_of[i]  : corridor id of cell i, or -1; offset_in[i] is its index in the corridor
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        passable, offsets, size = graph.passable, graph.offsets, graph.size
+        self.node_of = array("i", [-1]) * size
+        self.corridor_of = array("i", [-1]) * size
+        self.offset_in = array("i", [0]) * size
+        self.junctions = []
+        self.edges = []
+        self.corridors = []
+
+        open_cells = [i for i in range(size) if passable[i]]
+        for i in open_cells:
+            if sum(1 for d in offsets if passable[i + d]) != 2:
+                self._add_junction(i)
+        k = 0
+        while True:
+            while k < len(self.junctions):
+                self._walk_corridors(k)
+                k += 1
+            # a loop with no junction at all: cut it open at any cell
+            loose = next((i for i in open_cells if self.node_of[i] < 0 and self.corridor_of[i] < 0), None)
+            if loose is None:
+                break
+            self._add_junction(loose)
+
+    def _add_junction(self, i):
+        self.node_of[i] = len(self.junctions)
+        self.junctions.append(i)
+        self.edges.append([])
+
+    def _walk_corridors(self, a):
+        """Follow every corridor leaving junction `a` to the junction at its other end."""
+        passable, offsets = self.graph.passable, self.graph.offsets
+        node_of, corridor_of = self.node_of, self.corridor_of
+        start = self.junctions[a]
+        for d in offsets:
+            v = start + d
+            if not passable[v]:
+                continue
+            if node_of[v] >= 0:
+                self.edges[a].append((1, node_of[v], v))
+                continue
+            if corridor_of[v] >= 0:
+                continue  # walked from its other end already
+            prev, cur, chain = start, v, []
+            while node_of[cur] < 0:
+                chain.append(cur)
+                prev, cur = cur, next(cur + e for e in offsets if passable[cur + e] and cur + e != prev)
+            b = node_of[cur]
+            c = len(self.corridors)
+            self.corridors.append((a, b, chain))
+            for pos, cell in enumerate(chain):
+                corridor_of[cell] = c
+                self.offset_in[cell] = pos
+            length = len(chain) + 1
+            self.edges[a].append((length, b, chain[0]))
+            self.edges[b].append((length, a, chain[-1]))
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+    def _exits(self, i):
+        """(cost, node, first step towards it) for the nearest junctions of open cell i (-1 = i is the node)."""
+        k = self.node_of[i]
+        if k >= 0:
+            return [(0, k, -1)]
+        a, b, chain = self.corridors[self.corridor_of[i]]
+        p = self.offset_in[i]
+        towards_a = chain[p - 1] if p > 0 else self.junctions[a]
+        towards_b = chain[p + 1] if p + 1 < len(chain) else self.junctions[b]
+        return [(p + 1, a, towards_a), (len(chain) - p, b, towards_b)]
+
+    def next_index(self, s, g):
+        """First flat index after `s` on a shortest path to open cell `g` (`s` if equal), or -1."""
+        graph = self.graph
+        passable = graph.passable
+        if not passable[g]:
+            return -1
+        if s == g:
+            return s
+        # entry cells: s itself, or its open neighbours if s is blocked (a ghost on the gate)
+        if passable[s]:
+            entries = [(0, s, -1)]
+        else:
+            entries = [(1, s + d, s + d) for d in graph.offsets if passable[s + d]]
+
+        best, best_first = _INF, -1
+        goal_corridor = self.corridor_of[g]
+        goal_ends = {}
+        for cost, node, step in self._exits(g):
+            # cost from the node to g, and the node's first step into g's corridor
+            if cost < goal_ends.get(node, (_INF,))[0]:
+                goal_ends[node] = (cost, step if step < 0 else self._entry_step(node, g))
+
+        stride = graph.stride
+        gy, gx = divmod(g, stride)
+        g_score = {}
+        heap = []
+        for cost, cell, first in entries:
+            if cell == g:
+                if cost < best:
+                    best, best_first = cost, first
+                continue
+            if goal_corridor >= 0 and self.corridor_of[cell] == goal_corridor:
+                # same corridor: straight along it
+                p, q = self.offset_in[cell], self.offset_in[g]
+                chain = self.corridors[goal_corridor][2]
+                direct = cost + abs(p - q)
+                if direct < best:
+                    best, best_first = direct, first if first >= 0 else chain[p + 1 if q > p else p - 1]
+            for extra, node, step in self._exits(cell):
+                d = cost + extra
+                if d < g_score.get(node, _INF):
+                    g_score[node] = d
+                    y, x = divmod(self.junctions[node], stride)
+                    heapq.heappush(heap, (d + abs(x - gx) + abs(y - gy), d, node, first if first >= 0 else step))
+
+        junctions, edges = self.junctions, self.edges
+        while heap:
+            f, d, u, first = heapq.heappop(heap)
+            if f >= best:
+                break
+            if d > g_score[u]:
+                continue
+            end = goal_ends.get(u)
+            if end is not None and d + end[0] < best:
+                best, best_first = d + end[0], first if first >= 0 else end[1]
+            for w, v, step in edges[u]:
+                nd = d + w
+                if nd < g_score.get(v, _INF):
+                    g_score[v] = nd
+                    y, x = divmod(junctions[v], stride)
+                    heapq.heappush(heap, (nd + abs(x - gx) + abs(y - gy), nd, v, first if first >= 0 else step))
+        return best_first
+
+    def _entry_step(self, node, g):
+        """From junction `node` at an end of g's corridor, the first cell towards g."""
+        a, b, chain = self.corridors[self.corridor_of[g]]
+        if a == b:
+            # loop corridor: whichever way round is shorter
+            p = self.offset_in[g]
+            return chain[0] if p + 1 <= len(chain) - p else chain[-1]
+        return chain[0] if node == a else chain[-1]
+
+    def next_step(self, start, goal):
+        """First tile after `start` on a shortest path to `goal`, or None."""
+        graph = self.graph
+        s, g = graph.index(start), graph.index(goal)
+        if s < 0 or g < 0:
+            return None
+        nxt = self.next_index(s, g)
+        return graph.position(nxt) if nxt >= 0 else None
+
+
+# one junction graph per compiled MazeGraph (itself cached per wall version)
+_junction_cache = {}
+_JUNCTION_CACHE_SIZE = 8
+
+
+def get_junction_graph(maze, blocked=BLOCKED):
+    graph = get_graph(maze, blocked)
+    hit = _junction_cache.get(id(graph))
+    if hit is not None and hit.graph is graph:
+        return hit
+    if len(_junction_cache) >= _JUNCTION_CACHE_SIZE:
+        _junction_cache.pop(next(iter(_junction_cache)))
+    junctions = _junction_cache[id(graph)] = JunctionGraph(graph)
+    return junctions
+
+
+def junction(start, goal, maze):
+    """
+    start, goal are (x,y). maze is maze[y][x].
+    Return [start, next tile] on a shortest path (only the first step is
+    expanded), [start] if start == goal, or None.
+    """
+    if not maze or not maze[0]:
+        return None
+    nxt = get_junction_graph(maze).next_step(start, goal)
+    if nxt is None:
+        return None
+    return [start] if nxt == tuple(start) else [start, nxt]
@@ -0,0 +1,206 @@
+"""
+Shared grid search engine for the ghost pathfinders.
+
+Searches run on flat integer cell indices over a padded walkability
+bytearray, record one parent index per reached cell, and rebuild the path
+only once when the goal is found. No per-node path copies, no tuple
+allocation for the wall test, no linear scans of the open list.
+
+bfs.py, dfs.py and astar.py wrap these with the original
+(start, goal, maze) -> [(x, y), ...] | None API.
+"""
+import heapq
+from array import array
+
+BLOCKED = (3, 4, 5, 6, 7, 8, 9)  # walls + gate, same as the original ghost searches
+_INF = 0x7FFFFFFF
+
+
+class MazeGraph:
+    """
+    Walkability of a maze as a flat bytearray with a one-cell blocked
+    border (plus one spare row), so neighbours never need bounds checks:
+    index(x, y) = (y + 1) * stride + (x + 1).
+    """
+
+    def __init__(self, maze, blocked=BLOCKED):
+        self.height = len(maze)
+        self.width = len(maze[0]) if self.height else 0
+        self.stride = stride = self.width + 2
+        self.size = stride * (self.height + 3)
+        blocked = frozenset(blocked)
+
+        passable = bytearray(self.size)
+        for y, row in enumerate(maze):
+            base = (y + 1) * stride + 1
+            passable[base:base + self.width] = bytes(0 if t in blocked else 1 for t in row)
+        self.passable = passable
+        # right, down, left, up: the neighbour order of the original searches
+        self.offsets = (1, stride, -1, -stride)
+
+        # templates copied (memcpy) at the start of each search
+        self._unvisited = array("i", [-1]) * self.size
+        self._zeros = array("i", [0]) * self.size
+        self._infinite = array("i", [_INF]) * self.size
+
+    def index(self, pos):
+        """Flat index of (x, y); tiles one step outside the maze are allowed (tunnels)."""
+        x, y = pos
+        if -1 <= x <= self.width and -1 <= y <= self.height:
+            return (y + 1) * self.stride + x + 1
+        return -1
+
+    def position(self, i):
+        y, x = divmod(i, self.stride)
+        return (x - 1, y - 1)
+
+    def rebuild_path(self, parent, goal):
+        """Follow parent links from `goal` back to the start (whose parent is itself)."""
+        path = [goal]
+        while parent[goal] != goal:
+            goal = parent[goal]
+            path.append(goal)
+        path.reverse()
+        return [self.position(i) for i in path]
+
+
+# Compiled graphs are reused across searches. A game Grid is keyed on its
+# wall version (eating pellets keeps it); plain lists on object identity
+# (not id(), so a recycled id can't return a stale graph).
+_graph_cache = {}
+_GRAPH_CACHE_SIZE = 8
+
+
+def get_graph(maze, blocked=BLOCKED):
+    version = getattr(maze, "version", None)
+    if version is not None:
+        key = ("version", version, tuple(blocked))
+        hit = _graph_cache.get(key)
+        if hit is not None:
+            return hit[1]
+    else:
+        key = (id(maze), tuple(blocked))
+        hit = _graph_cache.get(key)
+        if hit is not None and hit[0] is maze:
+            return hit[1]
+    graph = MazeGraph(maze, blocked)
+    if len(_graph_cache) >= _GRAPH_CACHE_SIZE:
+        _graph_cache.pop(next(iter(_graph_cache)))
+    _graph_cache[key] = (maze if version is None else None, graph)
+    return graph
+
+
+# -------------------------------------
+# Core searches on flat indices
+# Each returns (parent array or None if unreachable, expanded node count)
+# -------------------------------------
+def bfs_search(graph, s, g):
+    parent = graph._unvisited[:]
+    queue = graph._zeros[:]
+    passable, offsets = graph.passable, graph.offsets
+    parent[s] = s
+    queue[0] = s
+    head, tail = 0, 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        if u == g:
+            return parent, head
+        for d in offsets:
+            v = u + d
+            if passable[v] and parent[v] < 0:
+                parent[v] = u
+                queue[tail] = v
+                tail += 1
+    return None, head
+
+
+def dfs_search(graph, s, g):
+    parent = graph._unvisited[:]
+    stack = graph._zeros[:]
+    passable, offsets = graph.passable, graph.offsets
+    parent[s] = s
+    stack[0] = s
+    top, expanded = 1, 0
+    while top:
+        top -= 1
+        u = stack[top]
+        expanded += 1
+        if u == g:
+            return parent, expanded
+        for d in offsets:
+            v = u + d
+            if passable[v] and parent[v] < 0:
+                parent[v] = u
+                stack[top] = v
+                top += 1
+    return None, expanded
+
+
+def astar_search(graph, s, g):
+    parent = graph._unvisited[:]
+    g_score = graph._infinite[:]
+    closed = bytearray(graph.size)
+    passable, offsets, stride = graph.passable, graph.offsets, graph.stride
+    goal_y, goal_x = divmod(g, stride)
+    start_y, start_x = divmod(s, stride)
+
+    parent[s] = s
+    g_score[s] = 0
+    open_heap = [(abs(start_x - goal_x) + abs(start_y - goal_y), s)]
+    expanded = 0
+    while open_heap:
+        _, u = heapq.heappop(open_heap)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        expanded += 1
+        if u == g:
+            return parent, expanded
+        tentative = g_score[u] + 1
+        for d in offsets:
+            v = u + d
+            if passable[v] and not closed[v] and tentative < g_score[v]:
+                g_score[v] = tentative
+                parent[v] = u
+                vy, vx = divmod(v, stride)
+                heapq.heappush(open_heap, (tentative + abs(vx - goal_x) + abs(vy - goal_y), v))
+    return None, expanded
+
+
+def distance_field(graph, t):
+    """
+    Reverse BFS from target index `t` over the whole maze: steps from every
+    cell to `t` (-1 = unreachable). Moves are reversible, so it's a plain BFS.
+    """
+    dist = graph._unvisited[:]
+    queue = graph._zeros[:]
+    passable, offsets = graph.passable, graph.offsets
+    dist[t] = 0
+    queue[0] = t
+    head, tail = 0, 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        du = dist[u] + 1
+        for d in offsets:
+            v = u + d
+            if passable[v] and dist[v] < 0:
+                dist[v] = du
+                queue[tail] = v
+                tail += 1
+    return dist
+
+
+def find_path(search, start, goal, maze, blocked=BLOCKED):
+    """Run `search` on `maze` and return the path [(x, y), ...] from start to goal, or None."""
+    if not maze or not maze[0]:
+        return None
+    graph = get_graph(maze, blocked)
+    s, g = graph.index(start), graph.index(goal)
+    if s < 0 or g < 0:
+        return None
+    parent, _ = search(graph, s, g)
+    if parent is None:
+        return None
+    return graph.rebuild_path(parent, g)
@@ -5,30 +5,48 @@ import os
 import traceback
 from game.map_loader import MapLoader
 from game.entities import create_entities
-from game.ui import draw_hud, draw_power_bar, draw_center_text
+from game.ui import draw_power_bar, draw_center_text, get_font, OverlayCompositor
 from ghosts.ghost_ai import GhostAI
-from game.renderer import compute_tile_size, make_screen_for_grid, build_render_surface, draw_grid
+from game.renderer import compute_tile_size, make_screen_for_grid, build_render_surface, draw_grid, MazeRenderer, DisplayRenderer
 from game.state import reset_positions, check_ghost_collision, initialize_round
 from game.ai_controller import update_ghosts
 from game.update import handle_pellets, handle_fruit
 from game.assets import load_and_scale_fruit
-from pacman_logic.pacman_agent import get_pacman_action
+from pacman_logic.pacman_agent import AgentSession
+from pacman_logic.mcts import shutdown_pool
+from game.ai_worker import AIWorker, make_snapshot
 from pacman_logic.util import DIRECTIONS
+from game.engine import FRUIT_SCORE, FRUIT_TRIGGER_COUNTS, GHOST_SCORE, DEATH_PENALTY
+from game.distance_table import PACMAN_BLOCKED
 
 # ---------------- Configuration ----------------
 FPS = 60
 POWER_TIME = 8 * FPS  # seconds of power mode
-FRUIT_SCORE = 100
 FRUIT_TIME = 8 * FPS  # fruit visible for 8 seconds
-FRUIT_TRIGGER_COUNTS = {30, 70, 120}  # spawn fruit after these many pellets
 FRUIT_PATH = "assets/fructul_pasiunii.png"
 
+# on-screen legend of key controls
+LEGEND_LINES = [
+    "Esc: Quit",
+    "A: Toggle Pac-Man AI",
+    "K: Cycle Pac-Man AI (reflex/minmax/alphabeta/mcts)",
+    "B: Background AI (off/thread/process)",
+    "W: MCTS workers (1/all cores)",
+    "P: Toggle Ghost Paths",
+    "1-4, 8-9: Ghost AI mode (bfs/dfs/astar/random, flow/junction)",
+    "5-7: Difficulty (Easy/Medium/Hard)",
+    "R: Random Maze Mutation",
+    "F: Toggle Fullscreen",
+    "V: Cycle Renderer (direct/cached/full)"
+]
+
 
 # ---------------- Main ----------------
 def main():
     pygame.init()
     pygame.display.set_caption("Pac-Man AI Edition")
-    font = pygame.font.SysFont("Arial", 20)
+    font = get_font("Arial", 20)
+    overlay = OverlayCompositor(font, get_font("Arial", 16))   # prerendered HUD fields + legend
     clock = pygame.time.Clock()
 
     # --- Initial Setup ---
@@ -99,13 +117,22 @@ def main():
     show_paths = False
 
     # --- Pac-Man AI setup ---
-    pacman_ai_mode = "reflex"   # 'reflex' | 'minmax' | 'alphabeta'
+    pacman_ai_mode = "reflex"   # 'reflex' | 'minmax' | 'alphabeta' | 'mcts'
     pacman_ai_depth = 2
+    pacman_ai_budget_ms = 10    # alpha-beta / mcts search until this is spent (per AI decision)
+    pacman_ai_workers = 1       # mcts root-parallel processes (W toggles 1 / all cores; synchronous AI only)
+    pacman_agents = AgentSession()  # agents (and their search caches) live across frames
+    pacman_ai_async = None      # None | 'thread' | 'process': plan in the background (B cycles)
+    pacman_ai_worker = None
 
     # --- Game state ---
     score, lives = 0, 3
     power_mode, power_timer = False, 0
     fullscreen = False
+    # 'direct': draw at window resolution from a pre-scaled atlas | 'cached': static maze layer + dirty
+    # rects, scaled to the window | 'full': redraw + smoothscale + flip (V cycles)
+    render_mode = "direct"
+    maze_renderer = DisplayRenderer()
 
     # --- Reset helper (delegated to game.state.initialize_round) ---
     # initial round values (use the centralized initializer so event handlers can reuse it)
@@ -125,77 +152,22 @@ def main():
     # keep previous state to detect fruit spawn/disappear transitions
     prev_fruit_active = False
 
-    # draw a small on-screen legend of key controls
-    def draw_legend(surface, font):
-        lines = [
-            "Esc: Quit",
-            "A: Toggle Pac-Man AI",
-            "K: Cycle Pac-Man AI (reflex/minmax/alphabeta)",
-            "P: Toggle Ghost Paths",
-            "1-4: Ghost AI mode (bfs/dfs/astar/random)",
-            "5-7: Difficulty (Easy/Medium/Hard)",
-            "R: Random Maze Mutation",
-            "F: Toggle Fullscreen"
-        ]
-        padding = 6
-        line_h = font.get_linesize()
-        box_w = max(font.size(l)[0] for l in lines) + padding * 2
-        box_h = line_h * len(lines) + padding * 2
-        x = 10
-        y = 10
-        # semi-transparent background
-        bg = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
-        bg.fill((0, 0, 0, 160))
-        surface.blit(bg, (x, y))
-        # render lines
-        tx = x + padding
-        ty = y + padding
-        for l in lines:
-            txt = font.render(l, True, (230, 230, 230))
-            surface.blit(txt, (tx, ty))
-            ty += line_h
-
-    # small BFS pathfinder (tile coords) used to draw ghost paths when toggled
-    def find_path_bfs(grid, start, goal):
-        from collections import deque
-        if start == goal:
-            return [start]
-        h, w = len(grid), len(grid[0])
-        def walkable(x, y):
-            if not (0 <= y < h and 0 <= x < w):
-                return False
-            return grid[y][x] not in (3,4,5,6,7,8)
-        q = deque([start])
-        parent = {start: None}
-        while q:
-            cur = q.popleft()
-            for dx, dy in DIRECTIONS.values():
-                if (dx, dy) == (0, 0):
-                    continue
-                nxt = (cur[0] + dx, cur[1] + dy)
-                if nxt in parent:
-                    continue
-                if not walkable(nxt[0], nxt[1]):
-                    continue
-                parent[nxt] = cur
-                if nxt == goal:
-                    # reconstruct
-                    path = []
-                    it = nxt
-                    while it is not None:
-                        path.append(it)
-                        it = parent[it]
-                    return list(reversed(path))
-                q.append(nxt)
-        return None
-
     # --- Game Loop ---
     running = True
+    frame = 0
     while running:
+        frame += 1
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if pacman_ai_worker:
+                    pacman_ai_worker.stop()
+                shutdown_pool()
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.VIDEORESIZE and not fullscreen:
+                # the direct renderer refits its tile size / atlas to the new window size
+                screen = pygame.display.get_surface()
+                maze_renderer.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
@@ -209,21 +181,44 @@ def main():
                     print(f"[PACMAN AI] {'enabled' if new_state else 'disabled'}")
                 elif event.key == pygame.K_p:
                     show_paths = not show_paths
+                    maze_renderer.invalidate()
+                elif event.key == pygame.K_v:
+                    render_mode = {"direct": "cached", "cached": "full"}.get(render_mode, "direct")
+                    maze_renderer = DisplayRenderer() if render_mode == "direct" else MazeRenderer()
+                    print(f"[RENDER] mode -> {render_mode}")
                 elif event.key == pygame.K_k:
                     # cycle pac-man AI modes
-                    modes = ["reflex", "minmax", "alphabeta"]
+                    modes = ["reflex", "minmax", "alphabeta", "mcts"]
+                    if pacman_ai_mode == "alphabeta":
+                        tt = pacman_agents.transposition_stats(reset=True)
+                        print(f"[PACMAN AI] transposition table: {tt['hits']}/{tt['probes']} hits "
+                              f"({tt['hit_rate']:.1%}), {tt['cutoffs']} cutoffs")
                     i = modes.index(pacman_ai_mode) if pacman_ai_mode in modes else 0
                     pacman_ai_mode = modes[(i + 1) % len(modes)]
                     print(f"[PACMAN AI] mode -> {pacman_ai_mode} (depth={pacman_ai_depth})")
+                elif event.key == pygame.K_w:
+                    pacman_ai_workers = 1 if pacman_ai_workers > 1 else max(1, os.cpu_count() or 1)
+                    print(f"[PACMAN AI] mcts workers -> {pacman_ai_workers}")
+                elif event.key == pygame.K_b:
+                    # cycle background planning: off -> thread -> process -> off
+                    if pacman_ai_worker:
+                        pacman_ai_worker.stop()
+                        pacman_ai_worker = None
+                    pacman_ai_async = {None: "thread", "thread": "process"}.get(pacman_ai_async)
+                    if pacman_ai_async:
+                        pacman_ai_worker = AIWorker(use_process=pacman_ai_async == "process").start()
+                    print(f"[PACMAN AI] background planning -> {pacman_ai_async or 'off'}")
                 elif event.key == pygame.K_f:
                     fullscreen = not fullscreen
                     if fullscreen:
-                        pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
                     else:
                         screen = make_screen_for_grid(grid, tile_size)
                     render_surface = build_render_surface(grid, tile_size)
-                elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
-                    modes = {pygame.K_1: "bfs", pygame.K_2: "dfs", pygame.K_3: "astar", pygame.K_4: "random"}
+                    maze_renderer.invalidate()
+                elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_8, pygame.K_9):
+                    modes = {pygame.K_1: "bfs", pygame.K_2: "dfs", pygame.K_3: "astar", pygame.K_4: "random",
+                             pygame.K_8: "flow", pygame.K_9: "junction"}
                     ai_mode = modes[event.key]
                     ghost_ai = GhostAI(ai_mode)
                     print(f"[AI] Mode set to {ai_mode.upper()}")
@@ -231,6 +226,8 @@ def main():
                     mutate = not mutate
                     loader.set_mutation_mode(mutate)
                     grid = loader.get_grid()
+                    ghost_ai.invalidate_cache()
+                    pacman_agents.on_maze_change()
                     # full reset via state helper (keeps same logic)
                     fruit_img, fruit_active, fruit_timer, fruit_pos, \
                     pellets_eaten, triggered_fruits, score, lives, \
@@ -247,6 +244,8 @@ def main():
                     difficulty = difficulties[event.key]
                     loader = MapLoader(difficulty=difficulty, mutate_predefined=mutate)
                     grid = loader.get_grid()
+                    ghost_ai.invalidate_cache()
+                    pacman_agents.on_maze_change()
                     fruit_img, fruit_active, fruit_timer, fruit_pos, \
                     pellets_eaten, triggered_fruits, score, lives, \
                     power_mode, power_timer, render_surface, pacman, ghosts = initialize_round(
@@ -269,10 +268,29 @@ def main():
                 "ghosts": [(int(g.x // tile_size), int(g.y // tile_size)) for g in ghosts],
                 "scared_timer": power_timer // FPS,
                 "score": score,
-                "lives": lives
+                "lives": lives,
+                "power_mode": power_mode,
+                "ghost_mode": ai_mode,
             }
             try:
-                action = get_pacman_action(ai_state, agent_type=pacman_ai_mode, depth=pacman_ai_depth)
+                if pacman_ai_worker:
+                    # hand over this frame and play the newest finished decision (never waits);
+                    # the worker keeps its own tables and pellet field
+                    pacman_ai_worker.submit(make_snapshot(
+                        frame, grid, ai_state["pacman_pos"], ai_state["ghosts"], score=score, lives=lives,
+                        power_mode=power_mode, scared_timer=ai_state["scared_timer"], ghost_mode=ai_mode,
+                        agent_type=pacman_ai_mode, depth=pacman_ai_depth, time_budget_ms=pacman_ai_budget_ms,
+                    ))
+                    decision = pacman_ai_worker.poll()
+                    action = decision["action"] if decision else None
+                else:
+                    ai_state.update({
+                        "distances": loader.distance_table(PACMAN_BLOCKED),
+                        "ghost_distances": loader.distance_table(),
+                        "pellet_field": loader.pellet_field(),
+                    })
+                    action = pacman_agents.get_action(ai_state, agent_type=pacman_ai_mode, depth=pacman_ai_depth,
+                                                      time_budget_ms=pacman_ai_budget_ms, workers=pacman_ai_workers)
             except Exception as e:
                 action = None
                 print("[PACMAN AI] exception when calling agent (printing traceback):")
@@ -303,20 +321,24 @@ def main():
 
         pacman.update(grid)
 
+        # NOTE: the per-frame rules below (ghosts, collisions, pellets, fruit) mirror
+        # game.engine.Simulation but are separate code; change both together.
+
         # --- Ghost AI Movement ---
         pac_tile = (int(pacman.x // tile_size), int(pacman.y // tile_size))
 
         # ghost movement: delegate to ai_controller
         ghost_move_delay = 10   # adjust ghost speed (same as before)
         frame_counter = getattr(main, "frame_counter", 0)
-        ghosts, frame_counter = update_ghosts(ghosts, pacman, grid, tile_size, ghost_ai, frame_counter, ghost_move_delay, power_mode)
+        ghosts, frame_counter = update_ghosts(ghosts, pacman, grid, tile_size, ghost_ai, frame_counter, ghost_move_delay, power_mode,
+                                              distances=loader.distance_table(), maze_version=loader.version)
         main.frame_counter = frame_counter
 
 
         # --- Collision Handling ---
         collision = check_ghost_collision(pacman, ghosts, tile_size, power_mode)
         if collision == "dead":
-            score -= 500
+            score -= DEATH_PENALTY
             lives -= 1
             if lives <= 0:
                 text = font.render("GAME OVER", True, (255, 0, 0))
@@ -334,9 +356,10 @@ def main():
                 screen.blit(text, (screen.get_width() // 2 - 40, screen.get_height() // 2))
                 pygame.display.flip()
                 pygame.time.wait(1500)
+                maze_renderer.invalidate()
                 continue
         elif collision == "eat":
-            score += 200
+            score += GHOST_SCORE
 
         # --- Power Timer ---
         if power_mode:
@@ -380,58 +403,83 @@ def main():
         score += fruit_score
 
         # --- Win condition ---
-        if all(tile not in (1, 2) for row in grid for tile in row):
-            # show centered win overlay via UI helper
-            scaled_surface = pygame.transform.smoothscale(render_surface, screen.get_size())
-            screen.blit(scaled_surface, (0, 0))
+        if grid.pellets_left == 0:
+            # show centered win overlay via UI helper (direct mode: last frame is already on screen)
+            if render_mode != "direct":
+                scaled_surface = pygame.transform.smoothscale(render_surface, screen.get_size())
+                screen.blit(scaled_surface, (0, 0))
             draw_center_text(screen, font, "YOU WIN!", (255, 255, 0))
             pygame.display.flip()
             pygame.time.wait(2000)
             break
 
         # --- Drawing ---
-        render_surface.fill((0, 0, 0))
-        draw_grid(render_surface, grid, tile_size)
-        pacman.draw(render_surface)
-        for ghost in ghosts:
-            ghost.draw(render_surface)
+        # paths are drawn on `view` at `view_tile` px per tile, offset by `view_origin`
+        view, view_tile, view_origin = render_surface, tile_size, (0, 0)
+        if render_mode != "full":
+            # cached wall layer + pellet patches; only moved sprites are redrawn
+            sprites = [(pacman.sprite, pacman.rect)] + [(g.sprite, g.rect) for g in ghosts]
+            if fruit_active and fruit_pos:
+                sprites.append((fruit_img, fruit_img.get_rect(center=fruit_pos)))
+        if render_mode == "direct":
+            updates = maze_renderer.draw(screen, grid, tile_size, sprites, full=show_paths)
+            view, view_tile, view_origin = screen, maze_renderer.tile_size, maze_renderer.origin
+        elif render_mode == "cached":
+            dirty = maze_renderer.draw(render_surface, grid, tile_size, sprites, full=show_paths)
+        else:
+            render_surface.fill((0, 0, 0))
+            draw_grid(render_surface, grid, tile_size)
+            pacman.draw(render_surface)
+            for ghost in ghosts:
+                ghost.draw(render_surface)
         # draw ghost paths when toggled
         if show_paths:
             colors = [(255, 0, 0), (0, 255, 0), (0, 160, 255), (255, 165, 0)]
             for i, g in enumerate(ghosts):
                 try:
                     g_tile = (int(g.x // tile_size), int(g.y // tile_size))
-                    path = find_path_bfs(grid, g_tile, pac_tile)
+                    path = loader.distance_table(PACMAN_BLOCKED).path(g_tile, pac_tile)
                 except Exception:
                     path = None
                 if path:
                     pts = []
                     for tx, ty in path:
-                        cx = int(tx * tile_size + tile_size / 2)
-                        cy = int(ty * tile_size + tile_size / 2)
+                        cx = int(view_origin[0] + tx * view_tile + view_tile / 2)
+                        cy = int(view_origin[1] + ty * view_tile + view_tile / 2)
                         pts.append((cx, cy))
                     col = colors[i % len(colors)]
                     if len(pts) >= 2:
-                        pygame.draw.lines(render_surface, col, False, pts, 3)
+                        pygame.draw.lines(view, col, False, pts, 3)
                     for p in pts:
-                        pygame.draw.circle(render_surface, col, p, 4)
-        if fruit_active and fruit_pos:
+                        pygame.draw.circle(view, col, p, 4)
+        if render_mode == "full" and fruit_active and fruit_pos:
             rect = fruit_img.get_rect(center=fruit_pos)
             render_surface.blit(fruit_img, rect)
 
-        # scale & blit maze -> then draw overlays via UI
-        scaled_surface = pygame.transform.smoothscale(render_surface, screen.get_size())
-        screen.blit(scaled_surface, (0, 0))
-        draw_hud(screen, font, difficulty, score, lives, pacman.use_ai, mutate)
+        # scale & blit maze (only the dirty parts when cached) -> then draw overlays via UI
+        if render_mode == "cached":
+            updates = maze_renderer.present(screen, render_surface, dirty)
+        elif render_mode == "full":
+            scaled_surface = pygame.transform.smoothscale(render_surface, screen.get_size())
+            screen.blit(scaled_surface, (0, 0))
+        ai_lag = pacman_ai_worker.staleness(frame) if pacman_ai_worker and pacman.use_ai else None
+        overlays = [overlay.draw_hud(screen, difficulty, score, lives, pacman.use_ai, mutate, ai_lag)]
         if power_mode:
-            draw_power_bar(screen, power_timer, POWER_TIME)
+            overlays.append(draw_power_bar(screen, power_timer, POWER_TIME))
 
         # draw controls legend (small, top-left)
-        draw_legend(screen, pygame.font.SysFont("Arial", 16))
+        overlays.append(overlay.draw_legend(screen, LEGEND_LINES))
 
-        pygame.display.flip()
+        if render_mode == "full":
+            pygame.display.flip()
+        else:
+            pygame.display.update(updates + maze_renderer.overlays_drawn(overlays))
         clock.tick(FPS)
 
+    if pacman_ai_worker:
+        pacman_ai_worker.stop()
+    shutdown_pool()
+
 
 if __name__ == "__main__":
     main()
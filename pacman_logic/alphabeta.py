@@ -1,63 +1,313 @@
-from pacman_logic.util import terminal_test, legal_actions_from, generate_successor, evaluation_function
+import time
+from array import array
+
+from pacman_logic.search_state import SearchState, ACTION_NAMES, STOP, STOP_ONLY
+from pacman_logic.transposition import TranspositionTable, MOVE
+
+# deepest iteration tried when searching on a time budget
+MAX_ITERATIVE_DEPTH = 32
+# nodes between clock reads while a deadline is set
+_DEADLINE_POLL = 64
+# history entries per (agent, cell): UP, DOWN, LEFT, RIGHT, STOP
+_CODES = 5
+# halve the history scores every this many get_action calls, so old cutoffs fade
+_HISTORY_AGING = 8
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+def _first(acts, move):
+    """Put the move leading to `move` (a next cell) first."""
+    if move < 0 or len(acts) < 2:
+        return acts
+    return sorted(acts, key=lambda m: m[1] != move)
 
 class AlphaBetaAgent:
-    def __init__(self, depth=2):
+    """
+    Alpha-beta over SearchState with a transposition table.
+
+    Move ordering (with `move_ordering`, the default), best first:
+      1. previous iteration's principal variation, else the table's best move
+      2. the two killer moves of this ply (moves that caused a cutoff at the
+         same ply in a sibling subtree)
+      3. history score of (agent, cell, direction), raised on every cutoff
+      4. static guess: Pac-Man towards the nearest pellet and away from the
+         nearest ghost, ghosts towards Pac-Man
+
+    `nodes` counts the nodes visited by the last get_action, and
+    `iteration_nodes` the nodes of each completed depth, so the effective
+    branching factor is iteration_nodes[d] / iteration_nodes[d - 1].
+
+    The history table is kept between get_action calls (slowly aged); call
+    `reset()` when the round or the maze changes.
+    """
+
+    def __init__(self, depth=2, table=None, time_budget_ms=None, move_ordering=True):
         self.depth = max(1, depth)
+        # pass a shared table to keep it between get_action calls
+        self.table = table if table is not None else TranspositionTable()
+        # with a budget, search deeper and deeper until it runs out (`depth` is ignored)
+        self.time_budget_ms = time_budget_ms
+        self.move_ordering = move_ordering
+        self.completed_depth = 0
+        self.pv = []
+        self.root_best = STOP
+        self.nodes = 0
+        self.iteration_nodes = []
+        self.killers = []
+        self.history = None
+        self.searches = 0
+
+    def reset(self):
+        """Forget everything learned so far (new round or new maze)."""
+        self.table.clear()
+        self.history = None
+        self.killers = []
+        self.pv = []
+        self.completed_depth = 0
+        self.searches = 0
 
     def get_action(self, state):
-        num_ghosts = len(state.get('ghosts', []))
-        num_agents = 1 + num_ghosts
+        # the budget covers building the search state too
+        deadline = time.perf_counter() + (self.time_budget_ms or 0) / 1000.0
+        s = SearchState.from_state(state)
+        self.table.new_search(s.version)
+        self.nodes = 0
+        self.iteration_nodes = []
+        max_depth = MAX_ITERATIVE_DEPTH if self.time_budget_ms else self.depth
+        num_agents = 1 + len(s.ghosts)
+        # killers are ply-relative, so they don't carry over to the next root
+        self.killers = [[-1, -1] for _ in range((max_depth + 1) * num_agents)]
+        size = num_agents * len(s.pellets) * _CODES
+        if self.history is None or len(self.history) != size:
+            self.history = array('l', [0]) * size
+        elif self.searches % _HISTORY_AGING == 0:
+            self.history = array('l', (h >> 1 for h in self.history))
+        self.searches += 1
 
-        def max_value(s, depth, alpha, beta):
-            if depth == 0 or terminal_test(s):
-                return evaluation_function(s)
-            v = -float('inf')
-            acts = legal_actions_from(s['pacman_pos'], s['grid'])
+        if not self.time_budget_ms:
+            code, _ = self._search_root(s, self.depth)
+            self.completed_depth = self.depth
+            return ACTION_NAMES[code]
+        return ACTION_NAMES[self._iterative_deepening(s, deadline)]
+
+    def _iterative_deepening(self, s, deadline):
+        """
+        Depth 1, 2, 3, ... until the budget runs out; the answer is the best
+        move of the deepest iteration that finished. Each iteration tries
+        the previous one's principal variation first. If even depth 1 runs
+        out of time, the best root move it finished (or the first one in
+        static order) is played, so a decision never overruns the budget.
+        """
+        self.pv = []
+        self.completed_depth = 0
+        try:
+            best_code, self.pv = self._search_root(s, 1, deadline)
+        except SearchTimeout:
+            s.undo_all()
+            return self.root_best
+        self.completed_depth = 1
+        if len(s.legal_moves(0)) < 2:
+            return best_code
+
+        for depth in range(2, MAX_ITERATIVE_DEPTH + 1):
+            if time.perf_counter() >= deadline:
+                break
+            try:
+                code, pv = self._search_root(s, depth, deadline, self.pv)
+            except SearchTimeout:
+                s.undo_all()
+                break
+            best_code, self.pv = code, pv
+            self.completed_depth = depth
+        return best_code
+
+    def _search_root(self, s, depth, deadline=None, pv=()):
+        """
+        Fixed-depth alpha-beta from the root. Returns (best move code,
+        principal variation as a list of next cells, one per ply).
+        Raises SearchTimeout once `deadline` (perf_counter time) passes;
+        `root_best` then holds the best root move searched so far.
+        """
+        num_agents = 1 + len(s.ghosts)
+        tt = self.table
+        killers, history = self.killers, self.history
+        cells = len(s.pellets)
+        field = s.field
+        follow_pv = bool(pv)
+        nodes = 0
+
+        table = s.table
+        node_of = table.node_of if table is not None else None
+
+        def guess(agent, nxt):
+            # cheap static score of moving `agent` to cell `nxt` (higher = try sooner)
+            if node_of is None:
+                return 0
+            u = node_of[nxt]
+            if u < 0:
+                return 0
+            n, dist = table.n, table.dist
+            if agent:
+                t = node_of[s.pac]
+                return -dist[t * n + u] if t >= 0 else 0
+            dg = 10
+            for g in s.ghosts:
+                t = node_of[g]
+                if t >= 0 and dist[t * n + u] < dg:
+                    dg = dist[t * n + u]
+            dp = field.dist[u] if field is not None else 0
+            return (-1000 if dg <= 1 else 3 * dg) - 2 * dp
+
+        def order(agent, acts, ply, entry):
+            nonlocal follow_pv
+            if follow_pv and ply < len(pv):
+                first = pv[ply]
+            else:
+                follow_pv = False
+                first = entry[MOVE] if entry is not None else -1
+            if not self.move_ordering or len(acts) < 2:
+                return _first(acts, first)
+            k1, k2 = killers[ply]
+            base = (agent * cells + (s.ghosts[agent - 1] if agent else s.pac)) * _CODES
+
+            def rank(move):
+                # one int: PV/table move, then killers, then history, then the static guess
+                code, nxt = move
+                if nxt == first:
+                    pri = 3
+                else:
+                    pri = 2 if code == k1 else 1 if code == k2 else 0
+                return (pri << 56) + (history[base + code] << 20) + guess(agent, nxt)
+
+            return sorted(acts, key=rank, reverse=True)
+
+        def cutoff_by(agent, code, depth, ply):
+            # remember a move that refuted this node: killer for the ply, history for the cell
+            if not self.move_ordering:
+                return
+            slot = killers[ply]
+            if slot[0] != code:
+                slot[1] = slot[0]
+                slot[0] = code
+            cur = s.ghosts[agent - 1] if agent else s.pac
+            history[(agent * cells + cur) * _CODES + code] += depth * depth
+
+        def max_value(depth, ply, alpha, beta):
+            nonlocal follow_pv, nodes
+            nodes += 1
+            if deadline is not None and nodes % _DEADLINE_POLL == 0 and time.perf_counter() >= deadline:
+                raise SearchTimeout()
+            if depth == 0 or s.is_terminal():
+                return s.evaluate()
+            acts = s.legal_moves(0)
             if not acts:
-                return evaluation_function(s)
-            for a in acts:
-                v = max(v, min_value(generate_successor(s, 0, a), depth, 1, alpha, beta))
+                return s.evaluate()
+            key = s.turn_key(0)
+            entry = tt.probe(key)
+            if entry is not None:
+                hit = tt.cutoff(entry, depth, alpha, beta, s.score)
+                if hit is not None:
+                    return hit
+            alpha0 = alpha
+            v = -float('inf')
+            best = -1
+            for code, cell in order(0, acts, ply, entry):
+                s.apply(0, cell)
+                if num_agents > 1:
+                    val = min_value(depth, 1, ply + 1, alpha, beta)
+                else:
+                    val = max_value(depth - 1, ply + 1, alpha, beta)
+                s.undo()
+                follow_pv = False
+                if val > v:
+                    v, best = val, cell
                 if v >= beta:
-                    return v
+                    cutoff_by(0, code, depth, ply)
+                    break
                 alpha = max(alpha, v)
+            tt.store(key, depth, alpha0, beta, v, s.score, best)
             return v
 
-        def min_value(s, depth, agent_idx, alpha, beta):
-            if depth == 0 or terminal_test(s):
-                return evaluation_function(s)
+        def min_value(depth, agent_idx, ply, alpha, beta):
+            nonlocal follow_pv, nodes
+            nodes += 1
+            if deadline is not None and nodes % _DEADLINE_POLL == 0 and time.perf_counter() >= deadline:
+                raise SearchTimeout()
+            if depth == 0 or s.is_terminal():
+                return s.evaluate()
+            acts = s.legal_moves(agent_idx) or STOP_ONLY
+            key = s.turn_key(agent_idx)
+            entry = tt.probe(key)
+            if entry is not None:
+                hit = tt.cutoff(entry, depth, alpha, beta, s.score)
+                if hit is not None:
+                    return hit
+            beta0 = beta
             v = float('inf')
-            gi = agent_idx - 1
-            ghost_pos = s['ghosts'][gi] if gi < len(s['ghosts']) else None
-            acts = legal_actions_from(ghost_pos, s['grid']) if ghost_pos else ['STOP']
-            if not acts:
-                acts = ['STOP']
+            best = -1
             next_agent = agent_idx + 1
-            for a in acts:
-                succ = generate_successor(s, agent_idx, a)
+            for code, cell in order(agent_idx, acts, ply, entry):
+                s.apply(agent_idx, cell)
                 if next_agent == num_agents:
-                    val = max_value(succ, depth - 1, alpha, beta)
+                    val = max_value(depth - 1, ply + 1, alpha, beta)
                 else:
-                    val = min_value(succ, depth, next_agent, alpha, beta)
-                v = min(v, val)
+                    val = min_value(depth, next_agent, ply + 1, alpha, beta)
+                s.undo()
+                follow_pv = False
+                if val < v:
+                    v, best = val, cell
                 if v <= alpha:
-                    return v
+                    cutoff_by(agent_idx, code, depth, ply)
+                    break
                 beta = min(beta, v)
+            tt.store(key, depth, alpha, beta0, v, s.score, best)
             return v
 
         # choose best action
         best_score = -float('inf')
-        best_action = 'STOP'
+        best_action = STOP
+        best_cell = -1
         alpha = -float('inf')
         beta = float('inf')
-        
-        for a in legal_actions_from(state['pacman_pos'], state['grid']):
-            succ = generate_successor(state, 0, a)
-            if num_agents > 1:
-                val = min_value(succ, self.depth, 1, alpha, beta)
-            else:
-                val = max_value(succ, self.depth, alpha, beta)
-            if val > best_score:
-                best_score = val
-                best_action = a
-            alpha = max(alpha, val)
-        return best_action
+
+        root_moves = order(0, s.legal_moves(0), 0, None)
+        # until a root move is fully searched, the best guess is the first in move order
+        self.root_best = root_moves[0][0] if root_moves else STOP
+        try:
+            for code, cell in root_moves:
+                s.apply(0, cell)
+                if num_agents > 1:
+                    val = min_value(depth, 1, 1, alpha, beta)
+                else:
+                    val = max_value(depth - 1, 1, alpha, beta)
+                s.undo()
+                follow_pv = False
+                if val > best_score:
+                    best_score = val
+                    best_action = code
+                    best_cell = cell
+                    self.root_best = code
+                alpha = max(alpha, val)
+        finally:
+            self.nodes += nodes
+        self.iteration_nodes.append(nodes)
+        return best_action, self._principal_variation(s, best_cell, depth * num_agents)
+
+    def _principal_variation(self, s, root_cell, plies):
+        """Follow the table's best moves from the root for up to `plies` plies."""
+        if root_cell < 0:
+            return []
+        num_agents = 1 + len(s.ghosts)
+        pv = [root_cell]
+        s.apply(0, root_cell)
+        agent = 1 % num_agents
+        while len(pv) < plies and not s.is_terminal():
+            move = self.table.best_move(s.turn_key(agent))
+            if move < 0:
+                break
+            pv.append(move)
+            s.apply(agent, move)
+            agent = (agent + 1) % num_agents
+        s.undo_all()
+        return pv
@@ -0,0 +1,324 @@
+"""
+Monte Carlo Tree Search (UCT) Pac-Man agent.
+
+The tree holds only Pac-Man's decisions. After each Pac-Man move the
+ghosts answer with the game's own GhostAI policy (chase targets, scatter
+corners, frightened wandering), so there are no ghost min-layers and the
+cost grows with the number of rollouts, not exponentially with depth.
+It's open-loop: nodes are move sequences and each iteration replays
+them on one SearchState with apply/undo, so frightened ghosts sample a
+fresh random answer every time.
+
+A rollout continues from the new leaf with random (non-reversing)
+Pac-Man moves for `rollout_ticks` ticks, or until Pac-Man is caught or
+the board is cleared, and is scored with the alpha-beta evaluation
+relative to the root.
+
+With `workers > 1` the search is root-parallel. Every worker process
+grows its own tree from the same root for the whole budget, from a
+compact snapshot of the board, and the root visit counts are summed.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from game.distance_table import DistanceTable, GHOST_BLOCKED, PACMAN_BLOCKED
+from game.engine import GHOST_COLORS, TICKS_PER_SECOND, SimGhost
+from game.grid import Grid
+from game.pellet_field import PelletField
+from ghosts.ghost_ai import GhostAI
+from pacman_logic.search_state import SearchState, ACTION_NAMES, STOP, MOVE_DX, MOVE_DY
+
+DEFAULT_BUDGET_MS = 20
+ROLLOUT_TICKS = 12
+EXPLORATION = 1.0
+# evaluation points per unit of reward (a small pellet is 10 points)
+REWARD_SCALE = 100.0
+# how long past the deadline to wait for worker results before dropping them
+WORKER_GRACE_MS = 5
+# reverse of UP, DOWN, LEFT, RIGHT, STOP
+_REVERSE = (1, 0, 3, 2, 4)
+
+
+class Node:
+    """Pac-Man decision point: per-move children plus visit statistics."""
+
+    __slots__ = ('children', 'untried', 'visits', 'value')
+
+    def __init__(self):
+        self.children = {}
+        self.untried = None  # move list, filled on the first visit
+        self.visits = 0
+        self.value = 0.0
+
+    def select(self, exploration):
+        """UCT: child move maximizing mean reward + exploration bonus."""
+        log_n = math.log(self.visits)
+        best, best_score = None, -float('inf')
+        for move, child in self.children.items():
+            score = child.value / child.visits + exploration * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = move, score
+        return best
+
+
+class GhostPolicy:
+    """
+    GhostAI driving the ghosts of a SearchState. Chase/scatter answers are
+    memoised for the whole search (they only depend on positions); the
+    frightened walk and the "random" ghost mode are not. `table` is the ghosts' own distance
+    table (GHOST_BLOCKED: they can't cut through the house gate).
+    """
+
+    def __init__(self, s, grid, ghost_mode, power_ticks, rng, table=None):
+        self.s = s
+        self.grid = grid
+        self.table = table
+        # frozen clock: no chase/scatter switches inside a few seconds of lookahead
+        self.ai = GhostAI(ghost_mode, clock=lambda: 0.0, rng=rng)
+        self.sprites = [SimGhost(0, 0, GHOST_COLORS[i % len(GHOST_COLORS)]) for i in range(len(s.ghosts))]
+        self.power_ticks = power_ticks
+        self.version = getattr(grid, "version", None)
+        self._memo = {}
+        self.memoise = ghost_mode != "random"
+
+    def move(self, tick, pac_dir):
+        """Apply every ghost's next step to the state (one apply per ghost)."""
+        s, sprites = self.s, self.sprites
+        frightened = tick < self.power_ticks
+        pac = s.position(s.pac)
+        for sprite, cell in zip(sprites, s.ghosts):
+            sprite.x, sprite.y = s.position(cell)
+        blinky = s.ghosts[0] if s.ghosts else -1  # ghost 0 is red, the one Inky aims off
+        for gi, sprite in enumerate(sprites):
+            key = None
+            if self.memoise and not frightened:
+                key = (gi, s.ghosts[gi], s.pac, pac_dir, blinky)
+                nxt = self._memo.get(key)
+                if nxt is not None:
+                    s.apply(gi + 1, nxt)
+                    continue
+            target = self.ai.get_next_move({
+                "ghost_pos": (sprite.x, sprite.y),
+                "player_pos": pac,
+                "map": self.grid,
+                "color": sprite.color,
+                "ghosts": sprites,
+                "power_mode": frightened,
+                "pac_dir": (MOVE_DX[pac_dir], MOVE_DY[pac_dir]),
+                "distances": self.table,
+                "maze_version": self.version,
+            })
+            nxt = s.cell(target)
+            if key is not None:
+                self._memo[key] = nxt
+            s.apply(gi + 1, nxt)
+
+
+class MCTSAgent:
+    def __init__(self, time_budget_ms=DEFAULT_BUDGET_MS, workers=1, rollout_ticks=ROLLOUT_TICKS,
+                 exploration=EXPLORATION, seed=None):
+        self.time_budget_ms = time_budget_ms or DEFAULT_BUDGET_MS
+        self.workers = max(1, workers)
+        self.rollout_ticks = rollout_ticks
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.rollouts = 0
+
+    def reset(self):
+        """Nothing carries over between searches yet; kept for AgentSession."""
+        self.rollouts = 0
+
+    def get_action(self, state):
+        deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        futures = []
+        if self.workers > 1:
+            snapshot = make_snapshot(state)
+            pool = _get_pool(self.workers - 1)
+            # wall-clock deadline, so workers that start late still answer in time
+            stop_at = time.time() + self.time_budget_ms / 1000.0
+            futures = [
+                pool.submit(_search_snapshot, snapshot, stop_at, self.rollout_ticks,
+                            self.exploration, self.rng.getrandbits(32))
+                for _ in range(self.workers - 1)
+            ]
+
+        stats, rollouts = search(state, deadline, self.rollout_ticks, self.exploration, self.rng)
+        if futures:
+            # late workers (e.g. still building their distance table) are left out this time
+            grace = deadline - time.perf_counter() + WORKER_GRACE_MS / 1000.0
+            futures, _ = wait(futures, timeout=max(0.0, grace))
+        for fut in futures:
+            try:
+                worker_stats, worker_rollouts = fut.result()
+            except Exception as e:
+                print("[PACMAN AI] mcts worker failed:", e)
+                continue
+            rollouts += worker_rollouts
+            for code, (visits, value) in worker_stats.items():
+                total = stats.setdefault(code, [0, 0.0])
+                total[0] += visits
+                total[1] += value
+        self.rollouts = rollouts
+
+        if not stats:
+            return ACTION_NAMES[STOP]
+        # most visited root move; mean reward breaks ties
+        best = max(stats, key=lambda code: (stats[code][0], stats[code][1] / max(1, stats[code][0])))
+        return ACTION_NAMES[best]
+
+
+# -------------------------------------
+# Tree search (one process)
+# -------------------------------------
+def search(state, deadline, rollout_ticks=ROLLOUT_TICKS, exploration=EXPLORATION, rng=random):
+    """
+    Grow a UCT tree from `state` until `deadline` (perf_counter time).
+    Returns ({root move code: [visits, total reward]}, rollouts played).
+
+    `state["ghost_distances"]` is the GHOST_BLOCKED table the modeled
+    ghosts path with; without it one is built (and cached) per maze.
+    """
+    s = SearchState.from_state(state)
+    power_ticks = 0
+    if state.get("power_mode"):
+        power_ticks = max(1, int(state.get("scared_timer", 0) * TICKS_PER_SECOND))
+    ghost_table = state.get("ghost_distances")
+    if ghost_table is None:
+        ghost_table = _tables_for(state["grid"])[1]
+    ghosts = GhostPolicy(s, state["grid"], state.get("ghost_mode", "bfs"), power_ticks, rng, ghost_table)
+    root = Node()
+    root_value = s.evaluate()
+    moves = s.moves
+    rollouts = 0
+
+    def step(code, cell, tick):
+        # Pac-Man then ghosts; returns True if Pac-Man got caught
+        pac_before = s.pac
+        s.apply(0, cell)
+        if s.pac in s.ghosts:
+            return True
+        before = list(s.ghosts)
+        ghosts.move(tick, code)
+        for prev, now in zip(before, s.ghosts):
+            if now == s.pac or (now == pac_before and prev == s.pac):
+                return True
+        return False
+
+    while True:
+        if rollouts and time.perf_counter() >= deadline:
+            break
+        rollouts += 1
+        node, path = root, [root]
+        tick, caught, last = 0, False, STOP
+        applied = len(s._history)
+
+        # selection / expansion
+        while not caught and s.pellets_left:
+            if node.untried is None:
+                node.untried = [m for m in moves[s.pac]]
+                rng.shuffle(node.untried)
+            if node.untried:
+                code, cell = node.untried.pop()
+                child = node.children[(code, cell)] = Node()
+                caught = step(code, cell, tick)
+                tick, last = tick + 1, code
+                path.append(child)
+                break
+            if not node.children:
+                break
+            code, cell = node.select(exploration)
+            caught = step(code, cell, tick)
+            tick, last = tick + 1, code
+            node = node.children[(code, cell)]
+            path.append(node)
+
+        # rollout
+        end = tick + rollout_ticks
+        while not caught and s.pellets_left and tick < end:
+            options = moves[s.pac]
+            if not options:
+                break
+            forward = [m for m in options if m[0] != _REVERSE[last]] or options
+            code, cell = forward[rng.randrange(len(forward))]
+            caught = step(code, cell, tick)
+            tick, last = tick + 1, code
+
+        reward = (s.evaluate() - root_value) / REWARD_SCALE
+        while len(s._history) > applied:
+            s.undo()
+        for n in path:
+            n.visits += 1
+            n.value += reward
+
+    stats = {code: [child.visits, child.value] for (code, _), child in root.children.items()}
+    return stats, rollouts
+
+
+# -------------------------------------
+# Root-parallel workers
+# -------------------------------------
+_pool = None
+_pool_workers = 0
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the rollout worker processes (they are started on first use)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def make_snapshot(state):
+    """Picklable board + positions: (tiles bytes, width, pacman, ghosts, score, power, timer, ghost mode)."""
+    grid = state["grid"]
+    width = len(grid[0]) if grid else 0
+    tiles = bytes(t for row in grid for t in row)
+    return (
+        tiles, width, tuple(state["pacman_pos"]), [tuple(g) for g in state.get("ghosts", [])],
+        state.get("score", 0), state.get("power_mode", False), state.get("scared_timer", 0),
+        state.get("ghost_mode", "bfs"),
+    )
+
+
+# walls bytes -> (Pac-Man DistanceTable, ghost DistanceTable), per process
+_worker_tables = {}
+
+
+def _tables_for(grid):
+    """Pac-Man (PACMAN_BLOCKED) and ghost (GHOST_BLOCKED) tables for `grid`'s walls, cached."""
+    if not isinstance(grid, Grid):
+        grid = Grid(grid)
+    tables = _worker_tables.get(grid.walls)
+    if tables is None:
+        if len(_worker_tables) >= 4:
+            _worker_tables.clear()
+        tables = _worker_tables[grid.walls] = (DistanceTable(grid, PACMAN_BLOCKED),
+                                               DistanceTable(grid, GHOST_BLOCKED))
+    return tables
+
+
+def _search_snapshot(snapshot, stop_at, rollout_ticks, exploration, seed):
+    """Worker entry point: search the snapshot until wall-clock time `stop_at`."""
+    deadline = time.perf_counter() + max(0.0, stop_at - time.time())
+    tiles, width, pac, ghosts, score, power_mode, scared_timer, ghost_mode = snapshot
+    grid = Grid([list(tiles[i:i + width]) for i in range(0, len(tiles), width)])
+    table, ghost_table = _tables_for(grid)
+    state = {
+        "grid": grid, "pacman_pos": pac, "ghosts": ghosts, "score": score,
+        "power_mode": power_mode, "scared_timer": scared_timer, "ghost_mode": ghost_mode,
+        "distances": table, "ghost_distances": ghost_table, "pellet_field": PelletField(table, grid),
+    }
+    stats, rollouts = search(state, deadline, rollout_ticks, exploration, random.Random(seed))
+    return stats, rollouts
@@ -1,49 +1,49 @@
-from pacman_logic.util import terminal_test, legal_actions_from, generate_successor, evaluation_function
+from pacman_logic.search_state import SearchState, ACTION_NAMES, STOP, STOP_ONLY
 
 class MinmaxAgent:
     def __init__(self, depth=2):
         self.depth = max(1, depth)
 
     def get_action(self, state):
-        num_ghosts = len(state.get('ghosts', []))
-        num_agents = 1 + num_ghosts
+        s = SearchState.from_state(state)
+        num_agents = 1 + len(s.ghosts)
 
-        def max_value(s, depth):
-            if depth == 0 or terminal_test(s):
-                return evaluation_function(s)
-            v = -float('inf')
-            acts = legal_actions_from(s['pacman_pos'], s['grid'])
+        def max_value(depth):
+            if depth == 0 or s.is_terminal():
+                return s.evaluate()
+            acts = s.legal_moves(0)
             if not acts:
-                return evaluation_function(s)
-            for a in acts:
-                v = max(v, min_value(generate_successor(s, 0, a), depth, 1))
+                return s.evaluate()
+            v = -float('inf')
+            for _, cell in acts:
+                s.apply(0, cell)
+                v = max(v, min_value(depth, 1) if num_agents > 1 else max_value(depth - 1))
+                s.undo()
             return v
 
-        def min_value(s, depth, agent_idx):
-            if depth == 0 or terminal_test(s):
-                return evaluation_function(s)
+        def min_value(depth, agent_idx):
+            if depth == 0 or s.is_terminal():
+                return s.evaluate()
             v = float('inf')
-            gi = agent_idx - 1
-            ghost_pos = s['ghosts'][gi] if gi < len(s['ghosts']) else None
-            acts = legal_actions_from(ghost_pos, s['grid']) if ghost_pos else ['STOP']
-            if not acts:
-                acts = ['STOP']
+            acts = s.legal_moves(agent_idx) or STOP_ONLY
             next_agent = agent_idx + 1
-            for a in acts:
-                succ = generate_successor(s, agent_idx, a)
+            for _, cell in acts:
+                s.apply(agent_idx, cell)
                 if next_agent == num_agents:
-                    v = min(v, max_value(succ, depth - 1))
+                    v = min(v, max_value(depth - 1))
                 else:
-                    v = min(v, min_value(succ, depth, next_agent))
+                    v = min(v, min_value(depth, next_agent))
+                s.undo()
             return v
 
         # choose action with highest minmax value
         best_score = -float('inf')
-        best_action = 'STOP'
-        for a in legal_actions_from(state['pacman_pos'], state['grid']):
-            succ = generate_successor(state, 0, a)
-            val = min_value(succ, self.depth, 1) if num_agents > 1 else max_value(succ, self.depth)
+        best_action = STOP
+        for code, cell in s.legal_moves(0):
+            s.apply(0, cell)
+            val = min_value(self.depth, 1) if num_agents > 1 else max_value(self.depth - 1)
+            s.undo()
             if val > best_score:
                 best_score = val
-                best_action = a
-        return best_action
\ No newline at end of file
+                best_action = code
+        return ACTION_NAMES[best_action]
@@ -1,18 +1,103 @@
 from pacman_logic.reflex import ReflexAgent
 from pacman_logic.minmax import MinmaxAgent
 from pacman_logic.alphabeta import AlphaBetaAgent
+from pacman_logic.mcts import MCTSAgent
+from pacman_logic.transposition import TranspositionTable
 
-def get_pacman_action(game_state, agent_type='reflex', depth=2):
+ALPHABETA_NAMES = ('alphabeta', 'alpha-beta', 'alpha_beta')
+DEPTH_AGENTS = ('minmax',) + ALPHABETA_NAMES
+
+class AgentSession:
+    """
+    Keeps one agent per (type, depth) alive between calls, so whatever an
+    agent learns during a search (transposition table, history ordering)
+    carries over to the next frame.
+
+    Call `reset()` when a new round starts and `on_maze_change()` when the
+    walls change; the latter also happens automatically when the grid's
+    wall version differs from the previous call's.
+    """
+
+    def __init__(self):
+        self.agents = {}
+        # shared by every alpha-beta depth: entries record their own depth
+        self.table = TranspositionTable()
+        self.maze_version = None
+
+    def agent(self, agent_type='reflex', depth=2, time_budget_ms=None, workers=1):
+        """The session's agent for (type, depth), created on first use."""
+        agent_type = agent_type.lower()
+        if agent_type in ALPHABETA_NAMES:
+            agent_type = 'alphabeta'
+        key = (agent_type, depth if agent_type in DEPTH_AGENTS else None)
+        agent = self.agents.get(key)
+        if agent is None:
+            if agent_type == 'reflex':
+                agent = ReflexAgent()
+            elif agent_type == 'minmax':
+                agent = MinmaxAgent(depth=depth)
+            elif agent_type == 'alphabeta':
+                agent = AlphaBetaAgent(depth=depth, table=self.table)
+            elif agent_type == 'mcts':
+                agent = MCTSAgent(workers=workers)
+            else:
+                raise ValueError("Unknown agent type: " + str(agent_type))
+            self.agents[key] = agent
+        # per-call settings
+        if agent_type == 'alphabeta':
+            agent.time_budget_ms = time_budget_ms
+        elif agent_type == 'mcts':
+            agent.time_budget_ms = time_budget_ms or agent.time_budget_ms
+            agent.workers = max(1, workers)
+        return agent
+
+    def get_action(self, game_state, agent_type='reflex', depth=2, time_budget_ms=None, workers=1):
+        version = getattr(game_state.get('grid'), 'version', None)
+        if version != self.maze_version:
+            self.on_maze_change()
+            self.maze_version = version
+        return self.agent(agent_type, depth, time_budget_ms, workers).get_action(game_state)
+
+    def reset(self):
+        """New round: forget per-round search state of every agent."""
+        for agent in self.agents.values():
+            reset = getattr(agent, 'reset', None)
+            if reset is not None:
+                reset()
+        self.table.clear()
+
+    def on_maze_change(self):
+        """Walls changed: nothing learned on the old maze is valid."""
+        self.reset()
+        self.maze_version = None
+
+    def transposition_stats(self, reset=False):
+        """Hit/cutoff counters of the shared alpha-beta transposition table."""
+        stats = self.table.stats()
+        if reset:
+            self.table.reset_stats()
+        return stats
+
+# session behind the module-level helpers
+_session = AgentSession()
+
+def get_pacman_action(game_state, agent_type='reflex', depth=2, time_budget_ms=None, workers=1):
     """
     Get the action for Pacman based on the specified agent type and depth.
+    With `time_budget_ms`, alpha-beta deepens iteratively until the budget
+    is spent instead of stopping at `depth`. 'mcts' always runs on a time
+    budget (default 20 ms) and ignores `depth`; `workers` > 1 adds rollout
+    processes (root-parallel). Agents persist between calls (see AgentSession).
     """
-    agent_type = agent_type.lower()
-    if agent_type == 'reflex':
-        agent = ReflexAgent()
-    elif agent_type == 'minmax':
-        agent = MinmaxAgent(depth=depth)
-    elif agent_type in ('alphabeta', 'alpha-beta', 'alpha_beta'):
-        agent = AlphaBetaAgent(depth=depth)
+    return _session.get_action(game_state, agent_type, depth, time_budget_ms, workers)
+
+def reset_agents(maze_changed=False):
+    """Reset the module-level session for a new round (or a new maze)."""
+    if maze_changed:
+        _session.on_maze_change()
     else:
-        raise ValueError("Unknown agent type: " + str(agent_type))
-    return agent.get_action(game_state)
+        _session.reset()
+
+def transposition_stats(reset=False):
+    """Hit/cutoff counters of the shared alpha-beta transposition table."""
+    return _session.transposition_stats(reset)
@@ -0,0 +1,273 @@
+"""
+Mutable search state for the adversarial agents (make/unmake instead of copying).
+
+`generate_successor` copies the whole grid and ghost list for every ply.
+SearchState instead holds flat cell indices and its own pellet bytearray,
+and `apply(agent, move)` / `undo()` change them in place, remembering only
+the moved agent's previous cell and the pellet it ate. Moves are integer
+codes; `ACTION_NAMES[code]` gives the usual 'UP'/'DOWN'/... strings.
+
+When the state carries a PelletField, pellets eaten in the search are
+removed from it and put back on undo, so every leaf reads its exact
+nearest-pellet distance. The field is back to where it started once the
+search has unwound (and `sync()` repairs it if a search is interrupted).
+
+`key` is a Zobrist hash of Pac-Man's cell, each ghost's cell and the
+pellets eaten since the start of the round, updated by apply/undo. Since
+it's relative to the round start (not to the search root), a position
+reached in one frame's search has the same key in the next frame's.
+
+Evaluation uses the same formula as `util.evaluation_function`.
+"""
+import random
+from array import array
+
+from game.grid import Grid
+from game.distance_table import UNREACHABLE
+
+# Direction codes, in the same order as util.DIRECTIONS
+UP, DOWN, LEFT, RIGHT, STOP = range(5)
+ACTION_NAMES = ('UP', 'DOWN', 'LEFT', 'RIGHT', 'STOP')
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+MOVE_DX = (0, 0, -1, 1, 0)
+MOVE_DY = (-1, 1, 0, 0, 0)
+
+WALL_TILES = (3, 4, 5, 6, 7, 8)  # same walkability as util.is_walkable_tile
+PELLET_SCORES = (0, 10, 50)      # indexed by pellet tile (0 / 1 / 2)
+STOP_ONLY = ((STOP, -1),)
+
+# wall version -> move table, so repeated searches on one maze share it
+_move_tables = {}
+_MOVE_TABLE_CACHE_SIZE = 8
+
+# (cells, ghosts) -> ZobristKeys; fixed seed so keys are stable for a process
+_zobrist_keys = {}
+_ZOBRIST_SEED = 0x5EED
+
+
+def build_move_table(grid, width, height):
+    """
+    For every cell (walls included: agents can be rounded onto one) the
+    tuple of (code, next_cell) moves into walkable neighbours, in
+    UP/DOWN/LEFT/RIGHT order.
+    """
+    table = []
+    for y in range(height):
+        for x in range(width):
+            moves = []
+            for code in (UP, DOWN, LEFT, RIGHT):
+                nx, ny = x + MOVE_DX[code], y + MOVE_DY[code]
+                if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] not in WALL_TILES:
+                    moves.append((code, ny * width + nx))
+            table.append(tuple(moves))
+    return table
+
+
+def get_move_table(grid, width, height):
+    version = getattr(grid, 'version', None)
+    if version is None:
+        return build_move_table(grid, width, height)
+    table = _move_tables.get(version)
+    if table is None:
+        if len(_move_tables) >= _MOVE_TABLE_CACHE_SIZE:
+            _move_tables.pop(next(iter(_move_tables)))
+        table = _move_tables[version] = build_move_table(grid, width, height)
+    return table
+
+
+class ZobristKeys:
+    """Random 64-bit keys per (Pac-Man, cell), (ghost i, cell), eaten cell and agent to move."""
+
+    def __init__(self, cells, ghosts):
+        rng = random.Random(_ZOBRIST_SEED)
+        bits = rng.getrandbits
+        self.pacman = [bits(64) for _ in range(cells)]
+        self.ghosts = [[bits(64) for _ in range(cells)] for _ in range(ghosts)]
+        self.eaten = [bits(64) for _ in range(cells)]
+        self.turn = [bits(64) for _ in range(ghosts + 1)]
+
+
+def zobrist_keys(cells, ghosts):
+    keys = _zobrist_keys.get((cells, ghosts))
+    if keys is None:
+        keys = _zobrist_keys[(cells, ghosts)] = ZobristKeys(cells, ghosts)
+    return keys
+
+
+class SearchState:
+    """
+    pac          : Pac-Man's cell (y * width + x)
+    ghosts       : list of ghost cells
+    pellets      : bytearray of pellet tiles per cell (0 / 1 / 2)
+    score        : running score (pellets eaten in the search included)
+    pellets_left : remaining pellet count
+    key          : Zobrist hash of the position (see `turn_key` for the agent to move)
+    version      : wall version of the grid (None for plain lists)
+    """
+
+    __slots__ = (
+        'width', 'height', 'moves', 'pellets', 'pellet_cells', 'pac', 'ghosts',
+        'score', 'pellets_left', 'table', 'field', 'zobrist', 'key', 'version', '_history',
+    )
+
+    def __init__(self, grid, pacman_pos, ghosts, score=0, distances=None, pellet_field=None):
+        self.height = len(grid)
+        self.width = w = len(grid[0]) if self.height else 0
+        self.moves = get_move_table(grid, w, self.height)
+
+        if isinstance(grid, Grid):
+            self.pellets = bytearray(grid.pellets)
+            self.pellets_left = grid.pellets_left
+            initial = grid.initial_pellets
+            self.version = grid.version
+        else:
+            self.pellets = bytearray(t if t in (1, 2) else 0 for row in grid for t in row)
+            self.pellets_left = len(self.pellets) - self.pellets.count(0)
+            initial = self.pellets  # no round start known: hash relative to now
+            self.version = None
+        # cells that held a pellet at the root (fallback scan for the nearest one)
+        self.pellet_cells = array('i', (i for i, p in enumerate(self.pellets) if p))
+
+        self.pac = self.cell(pacman_pos)
+        self.ghosts = [self.cell(g) for g in ghosts]
+        self.score = score
+        self.table = distances
+        self.field = pellet_field
+        self._history = []
+
+        self.zobrist = keys = zobrist_keys(len(self.pellets), len(self.ghosts))
+        key = keys.pacman[self.pac]
+        for gi, g in enumerate(self.ghosts):
+            key ^= keys.ghosts[gi][g]
+        for i, (was, now) in enumerate(zip(initial, self.pellets)):
+            if was and not now:
+                key ^= keys.eaten[i]
+        self.key = key
+
+    @classmethod
+    def from_state(cls, state):
+        """Build from the agents' dict state (grid, pacman_pos, ghosts, score, ...)."""
+        return cls(
+            state['grid'], state['pacman_pos'], state.get('ghosts', []),
+            score=state.get('score', 0),
+            distances=state.get('distances'),
+            pellet_field=state.get('pellet_field'),
+        )
+
+    def cell(self, pos):
+        """Flat cell of (x, y), clamped onto the board (ghosts can sit in the tunnel)."""
+        x = min(max(int(pos[0]), 0), self.width - 1)
+        y = min(max(int(pos[1]), 0), self.height - 1)
+        return y * self.width + x
+
+    def position(self, cell):
+        return (cell % self.width, cell // self.width)
+
+    # -----------------------------------------------------------------
+    # Make / unmake
+    # -----------------------------------------------------------------
+    def legal_moves(self, agent):
+        """(code, next_cell) pairs for agent 0 (Pac-Man) or ghost agent-1."""
+        return self.moves[self.pac if agent == 0 else self.ghosts[agent - 1]]
+
+    def turn_key(self, agent):
+        """Hash of the position with `agent` to move (transposition table key)."""
+        return self.key ^ self.zobrist.turn[agent]
+
+    def apply(self, agent, next_cell):
+        """Move `agent` to `next_cell` (-1 = stay). Undo with `undo()`."""
+        keys = self.zobrist
+        if agent == 0:
+            prev = self.pac
+            eaten = 0
+            if next_cell >= 0:
+                self.pac = next_cell
+                self.key ^= keys.pacman[prev] ^ keys.pacman[next_cell]
+                eaten = self.pellets[next_cell]
+                if eaten:
+                    self.pellets[next_cell] = 0
+                    self.pellets_left -= 1
+                    self.score += PELLET_SCORES[eaten]
+                    self.key ^= keys.eaten[next_cell]
+                    if self.field is not None:
+                        self.field.remove(self.position(next_cell))
+            self._history.append((0, prev, eaten))
+        else:
+            gi = agent - 1
+            prev = self.ghosts[gi]
+            self._history.append((agent, prev, 0))
+            if next_cell >= 0:
+                self.ghosts[gi] = next_cell
+                ghost_keys = keys.ghosts[gi]
+                self.key ^= ghost_keys[prev] ^ ghost_keys[next_cell]
+
+    def undo(self):
+        agent, prev, eaten = self._history.pop()
+        keys = self.zobrist
+        if agent == 0:
+            cell = self.pac
+            if eaten:
+                self.pellets[cell] = eaten
+                self.pellets_left += 1
+                self.score -= PELLET_SCORES[eaten]
+                self.key ^= keys.eaten[cell]
+                if self.field is not None:
+                    self.field.add(self.position(cell))
+            self.key ^= keys.pacman[cell] ^ keys.pacman[prev]
+            self.pac = prev
+        else:
+            gi = agent - 1
+            cell = self.ghosts[gi]
+            self.key ^= keys.ghosts[gi][cell] ^ keys.ghosts[gi][prev]
+            self.ghosts[gi] = prev
+
+    def undo_all(self):
+        """Take back every applied move (e.g. after an interrupted search)."""
+        while self._history:
+            self.undo()
+
+    # -----------------------------------------------------------------
+    # Tests / evaluation
+    # -----------------------------------------------------------------
+    def is_terminal(self):
+        return self.pellets_left == 0 or self.pac in self.ghosts
+
+    def distance(self, a, b):
+        """Maze distance between two cells (Manhattan without a table / off the table)."""
+        table = self.table
+        if table is not None:
+            s, t = table.node_of[a], table.node_of[b]
+            if s >= 0 and t >= 0:
+                d = table.dist[t * table.n + s]
+                if d != UNREACHABLE:
+                    return d
+        w = self.width
+        return abs(a % w - b % w) + abs(a // w - b // w)
+
+    def nearest_pellet_distance(self):
+        if not self.pellets_left:
+            return 0
+        field = self.field
+        if field is not None:
+            u = field.table.node_of[self.pac]
+            if u >= 0 and field.dist[u] != UNREACHABLE:
+                return field.dist[u]
+        pellets, pac = self.pellets, self.pac
+        return min(self.distance(pac, c) for c in self.pellet_cells if pellets[c])
+
+    def evaluate(self):
+        """Same formula as util.evaluation_function."""
+        dp = self.nearest_pellet_distance()
+        if self.ghosts:
+            dg = min(self.distance(self.pac, g) for g in self.ghosts)
+        else:
+            dg = 999
+
+        val = self.score
+        val -= dp * 2
+        if dg <= 1:
+            val -= 1000
+        else:
+            val += dg * 3
+        val -= self.pellets_left
+        return val
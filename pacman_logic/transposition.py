@@ -0,0 +1,115 @@
+"""
+Bounded transposition table for the alpha-beta search.
+
+Entries are keyed by `SearchState.turn_key(agent)` (Zobrist hash of the
+position + agent to move) and live in a fixed-size slot array indexed by
+the low bits of the key, so memory stays bounded however long the game
+runs. The table is meant to outlive a single `get_action` call: keys are
+relative to the round start, so positions searched last frame are found
+again this frame. It's cleared when the maze (wall version) changes.
+
+Values are stored relative to the score at the node (value - score). The
+rest of the evaluation depends only on the position, so an entry stays
+valid when the real score moves for reasons the hash doesn't see (ghosts,
+fruit).
+"""
+
+# bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# entry tuple fields
+KEY, DEPTH, FLAG, VALUE, MOVE, GENERATION = range(6)
+
+
+class TranspositionTable:
+    """
+    probe(key) -> (key, depth, flag, value, move, generation) or None
+    store(key, depth, flag, value, move)
+
+    Replacement: a slot is overwritten by the same position, by an equal or
+    deeper search, or when its entry is from an earlier `new_search`.
+    """
+
+    def __init__(self, size_bits=16):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.version = None
+        self.generation = 0
+        self.reset_stats()
+
+    def new_search(self, version):
+        """Start a search on a maze with wall `version` (None = unknown: start empty)."""
+        if version is None or version != self.version:
+            self.clear()
+        self.version = version
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+
+    # -----------------------------------------------------------------
+    # Lookups / stores
+    # -----------------------------------------------------------------
+    def probe(self, key):
+        self.probes += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[KEY] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def best_move(self, key):
+        """Stored best move (next cell) for `key`, or -1; doesn't count as a probe."""
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[KEY] == key:
+            return entry[MOVE]
+        return -1
+
+    def cutoff(self, entry, depth, alpha, beta, score):
+        """
+        Value to return straight away if `entry` (searched at least `depth`
+        deep) settles the node for this (alpha, beta) window, else None.
+        """
+        if entry[DEPTH] < depth:
+            return None
+        value = entry[VALUE] + score
+        flag = entry[FLAG]
+        if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+            self.cutoffs += 1
+            return value
+        return None
+
+    def store(self, key, depth, alpha, beta, value, score, move=-1):
+        """Record a fail-soft search `value` obtained with window (alpha, beta)."""
+        if value <= alpha:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        i = key & self.mask
+        old = self.entries[i]
+        if (old is None or old[KEY] == key or depth >= old[DEPTH]
+                or old[GENERATION] != self.generation):
+            self.entries[i] = (key, depth, flag, value - score, move, self.generation)
+            self.stores += 1
+
+    # -----------------------------------------------------------------
+    # Stats
+    # -----------------------------------------------------------------
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+        self.stores = 0
+
+    def stats(self):
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "stores": self.stores,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "cutoff_rate": self.cutoffs / self.probes if self.probes else 0.0,
+        }
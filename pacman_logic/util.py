@@ -1,4 +1,6 @@
 import copy
+from game.grid import Grid
+from game.board_arrays import board_arrays
 
 DIRECTIONS = {
     'UP':    (0, -1),
@@ -11,6 +13,19 @@ DIRECTIONS = {
 def manhattan_distance(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+def maze_distance(state, a, b):
+    """
+    True corridor distance from the state's precomputed DistanceTable
+    ('distances'), falling back to Manhattan when there is no table or
+    either tile is off the table.
+    """
+    table = state.get('distances')
+    if table is not None:
+        d = table.distance(a, b)
+        if d is not None:
+            return d
+    return manhattan_distance(a, b)
+
 def in_bounds(grid, pos):
     x, y = pos
     return 0 <= y < len(grid) and 0 <= x < len(grid[0])
@@ -50,6 +65,9 @@ def legal_actions_from(pos, grid):
     return actions
 
 def find_all_pellets(grid):
+    arrays = board_arrays(grid)
+    if arrays is not None:
+        return arrays.pellet_positions()
     pellets = []
     for y, row in enumerate(grid):
         for x, t in enumerate(row):
@@ -72,19 +90,37 @@ def sense_ghosts(pac_pos, ghosts, radius=4):
             positions.append((gx, gy))
     return positions
 
+def nearest_pellet_distance(state):
+    """
+    (distance to the nearest pellet, pellets left) for the state.
+
+    Uses the root's PelletField ('pellet_field') when its nearest pellet is
+    still on this state's grid: that pellet is then also the nearest here,
+    since search states only ever have fewer pellets. Otherwise scans.
+    """
+    pac = state.get('pacman_pos')
+    grid = state.get('grid', [])
+    field = state.get('pellet_field')
+    nearest = field.nearest(pac) if field is not None else None
+    if nearest is not None:
+        d, (x, y) = nearest
+        if grid[y][x] in (1, 2):
+            left = grid.pellets_left if isinstance(grid, Grid) else len(find_all_pellets(grid))
+            return d, left
+
+    pellets = find_all_pellets(grid)
+    if not pellets:
+        return 0, 0
+    return min(maze_distance(state, pac, p) for p in pellets), len(pellets)
+
 def evaluation_function(state):
     pac = state.get('pacman_pos')
     ghosts = state.get('ghosts', [])
-    pellets = find_all_pellets(state.get('grid', []))
     score = state.get('score', 0)
-
-    if pellets:
-        dp = min(manhattan_distance(pac, p) for p in pellets)
-    else:
-        dp = 0
+    dp, pellets_left = nearest_pellet_distance(state)
 
     if ghosts:
-        dg = min(manhattan_distance(pac, g) for g in ghosts)
+        dg = min(maze_distance(state, pac, g) for g in ghosts)
     else:
         dg = 999
 
@@ -94,7 +130,7 @@ def evaluation_function(state):
         val -= 1000
     else:
         val += dg * 3
-    val -= len(pellets)
+    val -= pellets_left
     return val
 
 def generate_successor(state, agent_index, action):
@@ -103,12 +139,15 @@ def generate_successor(state, agent_index, action):
     agent_index == 0 -> pacman; >=1 -> ghost index = agent_index-1
     action is a string ('UP','LEFT',...) or tuple (dx,dy).
     """
+    grid = state.get('grid', [])
     new = {
-        'grid': [row[:] for row in state.get('grid', [])],
+        'grid': grid.copy() if isinstance(grid, Grid) else [row[:] for row in grid],
         'pacman_pos': tuple(state.get('pacman_pos')),
         'ghosts': [tuple(g) for g in state.get('ghosts', [])],
         'score': state.get('score', 0),
-        'lives': state.get('lives', 3)
+        'lives': state.get('lives', 3),
+        'distances': state.get('distances'),
+        'pellet_field': state.get('pellet_field')
     }
 
     if isinstance(action, tuple):
@@ -129,12 +168,12 @@ def generate_successor(state, agent_index, action):
         if is_walkable_tile(new['grid'], nx, ny):
             new['pacman_pos'] = (nx, ny)
             tile = new['grid'][ny][nx]
-            if tile == 1:
-                new['score'] += 10
-                new['grid'][ny][nx] = 0
-            elif tile == 2:
-                new['score'] += 50
-                new['grid'][ny][nx] = 0
+            if tile in (1, 2):
+                new['score'] += 10 if tile == 1 else 50
+                if isinstance(new['grid'], Grid):
+                    new['grid'].eat(nx, ny)
+                else:
+                    new['grid'][ny][nx] = 0
     else:
         gi = agent_index - 1
         if gi < len(new['ghosts']):
@@ -147,8 +186,11 @@ def generate_successor(state, agent_index, action):
     return new
 
 def terminal_test(state):
-    pellets = find_all_pellets(state.get('grid', []))
-    if not pellets:
+    grid = state.get('grid', [])
+    if isinstance(grid, Grid):
+        if grid.pellets_left == 0:
+            return True
+    elif not find_all_pellets(grid):
         return True
     pac = state.get('pacman_pos')
     for g in state.get('ghosts', []):
@@ -0,0 +1,21 @@
+import pytest
+
+from game.board import boards
+from game.map_format import NAME_BYTES, CompiledMap, compile_map
+
+
+def test_multibyte_name_round_trips(tmp_path):
+    name = "é" * (NAME_BYTES // 2)          # 2 bytes per character: exactly at the limit
+    path = tmp_path / "accents.pacmap"
+    compile_map(boards["EASY"], str(path), name)
+    compiled = CompiledMap(str(path))
+    assert compiled.name == name
+    assert compiled.tile_rows() == [list(row) for row in boards["EASY"]]
+
+
+def test_name_over_limit_is_rejected(tmp_path):
+    path = tmp_path / "long.pacmap"
+    # 31 ASCII bytes + a 2-byte character: a byte cut at 32 would split it
+    with pytest.raises(ValueError):
+        compile_map(boards["EASY"], str(path), "m" * (NAME_BYTES - 1) + "é")
+    assert not path.exists()
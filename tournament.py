@@ -0,0 +1,178 @@
+"""
+Headless tournament runner: every ghost AI x Pac-Man agent x board combination.
+
+Games run on the pygame-free engine (game/engine.py) across all cores with a
+process pool, and each finished game is appended to the results file right
+away (JSON lines, or CSV when the file name ends in .csv).
+
+Example:
+    python tournament.py --agents reflex alphabeta --depths 1 2 \\
+        --boards EASY MEDIUM --mutation-seeds 1 2 3 --games 5 --out results.jsonl
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.engine import Simulation
+from game.map_loader import MapLoader
+from pacman_logic.pacman_agent import get_pacman_action, reset_agents, transposition_stats
+
+GHOST_MODES = ["bfs", "dfs", "astar", "random"]
+PACMAN_AGENTS = ["reflex", "minmax", "alphabeta", "mcts"]
+BOARDS = ["EASY", "MEDIUM", "HARD"]
+DEPTH_AGENTS = ("minmax", "alphabeta")  # agents for which --depths applies
+
+RESULT_FIELDS = [
+    "board", "map_seed", "ghost_ai", "agent", "depth", "time_budget_ms", "game_seed",
+    "score", "ticks", "won", "lives", "agent_ms_per_tick", "sim_ms_per_tick",
+    "tt_hit_rate",
+]
+
+
+# -------------------------------------
+# Single game (runs inside a worker process)
+# -------------------------------------
+def play_game(job):
+    """Play one headless game and return its result row."""
+    board, map_seed, ghost_mode, agent, depth, game_seed, max_ticks, time_budget_ms = job
+    loader = MapLoader(difficulty=board, seed=map_seed, mutate_predefined=map_seed is not None)
+    sim = Simulation.from_loader(loader, ghost_mode=ghost_mode, seed=game_seed, max_ticks=max_ticks)
+
+    state = sim.observe()
+    reset_agents(maze_changed=True)
+    transposition_stats(reset=True)
+    agent_time = sim_time = 0.0
+    while not state["done"]:
+        t0 = time.perf_counter()
+        action = get_pacman_action(state, agent_type=agent, depth=depth, time_budget_ms=time_budget_ms)
+        t1 = time.perf_counter()
+        state = sim.step(action)
+        t2 = time.perf_counter()
+        agent_time += t1 - t0
+        sim_time += t2 - t1
+
+    ticks = max(1, state["tick"])
+    return {
+        "board": board,
+        "map_seed": map_seed,
+        "ghost_ai": ghost_mode,
+        "agent": agent,
+        "depth": depth if agent in DEPTH_AGENTS else None,
+        "time_budget_ms": time_budget_ms,
+        "game_seed": game_seed,
+        "score": state["score"],
+        "ticks": state["tick"],
+        "won": state["won"],
+        "lives": state["lives"],
+        "agent_ms_per_tick": round(agent_time * 1000 / ticks, 3),
+        "sim_ms_per_tick": round(sim_time * 1000 / ticks, 3),
+        "tt_hit_rate": round(transposition_stats()["hit_rate"], 4) if agent == "alphabeta" else None,
+    }
+
+
+# -------------------------------------
+# Matchup enumeration
+# -------------------------------------
+def build_jobs(ghost_modes, agents, depths, boards, mutation_seeds, games, max_ticks, base_seed=0,
+               time_budget_ms=None):
+    """Return one job tuple per game for the full cartesian product of matchups."""
+    agent_specs = []
+    for agent in agents:
+        if agent in DEPTH_AGENTS:
+            agent_specs.extend((agent, d) for d in depths)
+        else:
+            agent_specs.append((agent, 1))
+
+    # None = the predefined board, each seed = one mutated variant
+    map_seeds = [None] + list(mutation_seeds)
+
+    jobs = []
+    for board, map_seed, ghost_mode, (agent, depth) in itertools.product(boards, map_seeds, ghost_modes, agent_specs):
+        for g in range(games):
+            jobs.append((board, map_seed, ghost_mode, agent, depth, base_seed + g, max_ticks, time_budget_ms))
+    return jobs
+
+
+class ResultWriter:
+    """Append result rows to a .jsonl or .csv file, flushing after each row."""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_csv = path.lower().endswith(".csv")
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="")
+        self.csv = None
+        if self.is_csv:
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            if new_file:
+                self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv:
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_tournament(jobs, out_path, workers=None):
+    """Play all jobs in a process pool and stream each result to `out_path`."""
+    writer = ResultWriter(out_path)
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(play_game, job): job for job in jobs}
+            for fut in as_completed(futures):
+                done += 1
+                try:
+                    row = fut.result()
+                except Exception as e:
+                    print(f"[TOURNAMENT] game {futures[fut]} failed: {e}", file=sys.stderr)
+                    continue
+                writer.write(row)
+                print(
+                    f"[TOURNAMENT] {done}/{len(jobs)} {row['board']}/{row['map_seed']} "
+                    f"{row['ghost_ai']} vs {row['agent']}({row['depth']}) -> "
+                    f"score={row['score']} ticks={row['ticks']} won={row['won']}"
+                )
+    finally:
+        writer.close()
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Headless ghost-AI x Pac-Man-agent tournament.")
+    p.add_argument("--ghosts", nargs="+", default=GHOST_MODES, choices=GHOST_MODES + ["flow", "junction"])
+    p.add_argument("--agents", nargs="+", default=PACMAN_AGENTS, choices=PACMAN_AGENTS)
+    p.add_argument("--depths", nargs="+", type=int, default=[1, 2], help="search depths for minmax/alphabeta")
+    p.add_argument("--boards", nargs="+", default=BOARDS, choices=BOARDS)
+    p.add_argument("--mutation-seeds", nargs="*", type=int, default=[], help="MapLoader mutation seeds (besides the predefined board)")
+    p.add_argument("--games", type=int, default=3, help="games per matchup")
+    p.add_argument("--seed", type=int, default=0, help="base game seed")
+    p.add_argument("--max-ticks", type=int, default=1500)
+    p.add_argument("--time-budget-ms", type=float, default=None,
+                   help="per-decision budget: alphabeta deepens iteratively, mcts default 20")
+    p.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    p.add_argument("--out", default="tournament_results.jsonl", help=".jsonl or .csv results file")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = build_jobs(args.ghosts, args.agents, args.depths, args.boards,
+                      args.mutation_seeds, args.games, args.max_ticks, args.seed, args.time_budget_ms)
+    print(f"[TOURNAMENT] {len(jobs)} games on {args.workers or os.cpu_count()} workers -> {args.out}")
+    start = time.perf_counter()
+    run_tournament(jobs, args.out, workers=args.workers)
+    print(f"[TOURNAMENT] finished in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()